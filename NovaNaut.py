@@ -1,18 +1,36 @@
-import thumby
-import math
+import sys
+GAME_DIR = '/'.join(__file__.split('/')[0:-1])
+sys.path.insert(0, GAME_DIR)
+
 import random
 import time
-from micropython import const
+import gc
+from array import array
+from nova_platform import thumby, const, ticks_ms, ticks_us, ticks_diff, sleep_us
+from nova_trig import (ANGLE_STEPS, TRIG_SHIFT, SIN, QUARTER_TURN, ANGLE_MASK,
+                       SHIELD_X, SHIELD_Y, SHIELD_SEGMENTS, SHIELD_PHASES, SHIELD_STEP_MS,
+                       SPREAD_DX, SPREAD_DY)
+from nova_profile import Profiler
+from nova_gc import GcPolicy
+from nova_save import SaveStore, TOP_SCORES
+from nova_levels import SpawnSchedule, level_for_wave
+from nova_collide import sprite_mask, box_mask, hit
+from nova_sprites import SpriteSheet
+from nova_rng import Rng, RandomTable
+from nova_render import plot_points, draw_bullets, blit_aliens
+from nova_replay import InputLog, BTN_U, BTN_D, BTN_L, BTN_R, BTN_A, BTN_B
+from nova_audio import (AudioMixer, THEME, SND_SHOT, SND_CHARGED_SHOT, SND_KILL, SND_POWERUP,
+                        SND_OVERHEAT, SND_HIT)
 
 # === CONSTANTS ===
 SCREEN_WIDTH = const(72)
 SCREEN_HEIGHT = const(40)
 FPS = const(60)
+RENDER_EVERY = const(1)  # Simulation steps per render; 2 renders at 30 Hz
+MAX_FRAME_SKIP = const(4)  # Renders dropped in a row before the game slows down instead
 STAR_LAYERS = const(3)
 MAX_CHARGE = const(60)
-POWER_UP_CHANCE = const(0.2)  # Changed from 100 to 0.2 for clarity
-UPGRADE_COST = const(50)
-MAX_UPGRADE_LEVEL = const(3)
+POWER_UP_CHANCE = const(51)  # Out of 256, about 0.2
 FLASH_INTERVAL = const(10)
 SHAKE_DURATION = const(10)
 SHAKE_INTENSITY = const(2)
@@ -23,28 +41,84 @@ MACHINE_GUN_HEAT_MAX = const(100)
 HEAT_PER_SHOT = const(5)
 COOLING_RATE = const(1)
 MACHINE_GUN_RATE = const(5)
+PARTICLE_CAPACITY = const(128)
+PARTICLE_DIRECTIONS = const(32)  # Divides ANGLE_STEPS; DIRECTIONS * SPEEDS must be a power of two <= 256
+PARTICLE_SPEEDS = const(4)
+BULLET_CAPACITY = const(64)
+MAX_ALIENS = const(8)
+MAX_FIELD_POWERUPS = const(8)
+GRID_COLS = const(10)  # 8px broadphase cells covering x 0..79
+GRID_ROWS = const(6)   # and y 0..47; anything outside clamps to an edge cell
+GRID_MAX_ITEMS = const(16)
+FP_SHIFT = const(6)  # Fixed-point positions: 1/64 pixel units
+FP_ONE = const(1 << FP_SHIFT)
+FIXED_POINT = const(0)  # 1: player, aliens and floating texts move in fixed-point too
+PLAYER_SHIFT = const(8)  # The player's damped velocity needs finer steps than FP_SHIFT
+PLAYER_ONE = const(1 << PLAYER_SHIFT)
+
+# Profiler stages, indexing PROFILE_STAGES (CSV column names) and PROFILE_LABELS (overlay)
+PROF_PLAYER = const(0)
+PROF_BULLETS = const(1)
+PROF_ALIENS = const(2)
+PROF_PARTICLES = const(3)
+PROF_STARS = const(4)
+PROF_COLLISIONS = const(5)
+PROF_DRAW_STARS = const(6)
+PROF_FLASH = const(7)
+PROF_HUD = const(8)
+PROF_DISPLAY = const(9)
+PROFILE_STAGES = ('update_player_position', 'update_bullets', 'update_aliens', 'particles.update',
+                  'update_stars', 'check_collisions', 'draw_stars', 'draw_flash_effect',
+                  'draw_hud', 'display.update')
+PROFILE_LABELS = ('PLY', 'BUL', 'ALN', 'PRT', 'STR', 'COL', 'DST', 'FLS', 'HUD', 'DSP')
+PROFILE_PATH = GAME_DIR + '/profile.csv'
+SAVE_PATH = GAME_DIR + '/novanaut.sav'
+SPRITE_PATH = GAME_DIR + '/novanaut.spr'
+REPLAY_PATH = GAME_DIR + '/novanaut.rec'
+GC_STRICT = const(0)  # 1: raise if a frame allocates more than nova_gc.ALLOC_BUDGET bytes
+MUSIC = const(1)  # 0: sound effects only
+RECORD_INPUT = const(0)  # 1: record each game's buttons to REPLAY_PATH
+FX_SALT = const(0x5A5A)  # Keeps the cosmetic stream's seed apart from the gameplay one
 
 # Simplified tuple definition
 POWERUP_TYPES = ('SPEED', 'SHIELD', 'MULTI')
 
-# Pre-calculated bitmap for optimization
-playerMap = bytearray([
-    0b00000010, 0b00000110, 0b00001110, 0b00011110,
-    0b00111110, 0b01111110, 0b00111110, 0b00011110,
-    0b00001110, 0b00000110, 0b00000010, 0b00000000,
-    0b00000000, 0b00000000, 0b00000000, 0b00100000,
-    0b01110000, 0b11111000, 0b01110000, 0b00100000,
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,
-    0b00000000, 0b00000000
-])
-
-# Simplified alien maps using fewer bytes
-alienMaps = {
-    'basic': bytearray([60, 126, 219, 255, 255, 219, 126, 60]),
-    'scout': bytearray([24, 60, 126, 255, 255, 126, 60, 24]),
-    'elite': bytearray([60, 126, 255, 255, 255, 255, 126, 60]),
-    'boss': bytearray([60, 126, 255, 255, 255, 255, 126, 60] * 2)  # Simplified boss sprite
-}
+# Alien type ids index ALIEN_TYPES (the sprite sheet names) and the stat tables
+ALIEN_BASIC = const(0)
+ALIEN_SCOUT = const(1)
+ALIEN_ELITE = const(2)
+ALIEN_BOSS = const(3)
+ALIEN_TYPES = ('basic', 'scout', 'elite', 'boss')
+ALIEN_SPEED = (1, 1.5, 1, 0.5)
+ALIEN_SPEED_FP = tuple(int(speed * FP_ONE) for speed in ALIEN_SPEED)
+ALIEN_HEALTH = (2, 2, 4, 20)  # Half-hit units, like bullet power
+ALIEN_POINTS = (10, 10, 20, 100)
+ALIEN_WIDTH = (8, 8, 8, 16)
+BOSS_HOLD_X = const(SCREEN_WIDTH - 20)  # Bosses stop here and fight instead of flying past
+
+# Every bitmap is a memoryview into the one sprite sheet buffer
+SPRITE_SHEET = SpriteSheet(SPRITE_PATH)
+ALIEN_BITMAPS = tuple(SPRITE_SHEET.bitmap(name)[0] for name in ALIEN_TYPES)
+
+# Collision masks, built once from the bitmaps and the drawn shapes
+PLAYER_MASK = sprite_mask(*SPRITE_SHEET.bitmap('player'))
+ALIEN_MASKS = tuple(sprite_mask(*SPRITE_SHEET.bitmap(name)) for name in ALIEN_TYPES)
+BULLET_MASK = box_mask(3, 2)
+POWERUP_MASK = box_mask(6, 6)
+
+def damp(v):
+    """Scale a velocity by 0.9.
+
+    In FIXED_POINT mode this rounds to nearest, but always moves at least
+    one step toward zero so the ship still comes to rest.
+    """
+    if FIXED_POINT:
+        a = v if v >= 0 else -v
+        r = (a * 922 + 512) >> 10  # 922 / 1024 = 0.9004
+        if r == a and a:
+            r -= 1
+        return r if v >= 0 else -r
+    return v * 0.9
 
 class PowerUp:
     __slots__ = ('type', 'x', 'y', 'active', 'timer', 'width', 'height')
@@ -68,67 +142,364 @@ class PowerUp:
             return self.timer <= 0
         return False
 
+class Alien:
+    __slots__ = ('type', 'x', 'y', 'health', 'fx')
+    
+    def __init__(self, type, x, y):
+        self.type = type
+        self.x = x
+        self.y = y
+        self.health = ALIEN_HEALTH[type]
+        self.fx = x << FP_SHIFT  # Fixed-point x, only kept up in FIXED_POINT mode
+
 class ParticleSystem:
-    def __init__(self):
-        self.particles = []
+    """Fixed-capacity particles stored as parallel arrays.
+
+    Positions and velocities are fixed-point (FP_SHIFT) so update/draw are
+    pure integer work. Velocities come from a table built once, dead
+    particles are swap-removed, and emit drops particles once full, so
+    nothing is allocated after construction.
+    """
+    def __init__(self, noise, capacity=PARTICLE_CAPACITY, velocity_range=(0.5, 2.0)):
+        self.noise = noise  # Cosmetic RandomTable
+        self.capacity = capacity
+        self.count = 0
+        self.x = array('h', [0] * capacity)
+        self.y = array('h', [0] * capacity)
+        self.dx = array('h', [0] * capacity)
+        self.dy = array('h', [0] * capacity)
+        self.life = array('h', [0] * capacity)
+        
+        # One entry per (direction, speed) pair, indexed by random bits
+        low, high = velocity_range
+        self.vel_x = array('h')
+        self.vel_y = array('h')
+        for d in range(PARTICLE_DIRECTIONS):
+            step = d * (ANGLE_STEPS // PARTICLE_DIRECTIONS)
+            cos_d = SIN[(step + QUARTER_TURN) & ANGLE_MASK]
+            sin_d = SIN[step]
+            for s in range(PARTICLE_SPEEDS):
+                speed = int((low + (high - low) * s / (PARTICLE_SPEEDS - 1)) * FP_ONE)
+                self.vel_x.append((cos_d * speed) >> TRIG_SHIFT)
+                self.vel_y.append((sin_d * speed) >> TRIG_SHIFT)
     
-    def emit(self, x, y, count, velocity_range=(0.5, 2.0), lifetime_range=(20, 40)):
+    def emit(self, x, y, count, lifetime_range=(20, 40)):
+        n = self.count
+        space = self.capacity - n
+        if count > space:
+            count = space
+        x = int(x) << FP_SHIFT
+        y = int(y) << FP_SHIFT
+        low, high = lifetime_range
+        mask = len(self.vel_x) - 1
+        noise = self.noise
         for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(*velocity_range)
-            dx = math.cos(angle) * speed
-            dy = math.sin(angle) * speed
-            self.particles.append({
-                'x': x, 'y': y, 'dx': dx, 'dy': dy,
-                'life': random.randint(*lifetime_range)
-            })
+            v = noise.next() & mask
+            self.x[n] = x
+            self.y[n] = y
+            self.dx[n] = self.vel_x[v]
+            self.dy[n] = self.vel_y[v]
+            self.life[n] = noise.range(low, high)
+            n += 1
+        self.count = n
     
     def update(self):
-        i = len(self.particles) - 1
-        while i >= 0:
-            particle = self.particles[i]
-            particle['x'] += particle['dx']
-            particle['y'] += particle['dy']
-            particle['life'] -= 1
-            if particle['life'] <= 0:
-                self.particles.pop(i)
-            i -= 1
+        xs, ys, dxs, dys, life = self.x, self.y, self.dx, self.dy, self.life
+        n = self.count
+        i = 0
+        while i < n:
+            remaining = life[i] - 1
+            if remaining <= 0:
+                # Swap the last live particle into this slot and re-check it
+                n -= 1
+                xs[i] = xs[n]
+                ys[i] = ys[n]
+                dxs[i] = dxs[n]
+                dys[i] = dys[n]
+                life[i] = life[n]
+            else:
+                life[i] = remaining
+                xs[i] += dxs[i]
+                ys[i] += dys[i]
+                i += 1
+        self.count = n
     
     def draw(self):
-        for p in self.particles:
-            x, y = int(p['x']), int(p['y'])
-            if 0 <= x < SCREEN_WIDTH and 0 <= y < SCREEN_HEIGHT:
-                thumby.display.setPixel(x, y, 1)
+        plot_points(thumby.display.display.buffer, self.x, self.y, self.count, FP_SHIFT)
+
+class BulletPool:
+    """Bullets stored in preallocated parallel arrays.
+
+    Positions and velocities are fixed-point (FP_SHIFT); power is in
+    half-hit units so upgrades stay integral. spawn() and remove() are O(1):
+    removal swaps the last live bullet into the freed slot, so callers that
+    remove while iterating must re-check the same index.
+    """
+    
+    def __init__(self, capacity=BULLET_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        self.x = array('h', [0] * capacity)
+        self.y = array('h', [0] * capacity)
+        self.dx = array('h', [0] * capacity)
+        self.dy = array('h', [0] * capacity)
+        self.power = array('h', [0] * capacity)
+    
+    def __len__(self):
+        return self.count
+    
+    def clear(self):
+        self.count = 0
+    
+    def spawn(self, x, y, dx, dy, power):
+        n = self.count
+        if n >= self.capacity:
+            return False
+        self.x[n] = int(x * FP_ONE)
+        self.y[n] = int(y * FP_ONE)
+        self.dx[n] = dx
+        self.dy[n] = dy
+        self.power[n] = power
+        self.count = n + 1
+        return True
+    
+    def remove(self, i):
+        n = self.count - 1
+        self.x[i] = self.x[n]
+        self.y[i] = self.y[n]
+        self.dx[i] = self.dx[n]
+        self.dy[i] = self.dy[n]
+        self.power[i] = self.power[n]
+        self.count = n
+    
+    def remove_spent(self):
+        """Drop bullets whose power was zeroed by a hit."""
+        power = self.power
+        i = 0
+        while i < self.count:
+            if power[i] == 0:
+                self.remove(i)
+            else:
+                i += 1
+    
+    def update(self):
+        xs, ys, dxs, dys = self.x, self.y, self.dx, self.dy
+        limit = SCREEN_WIDTH << FP_SHIFT
+        i = 0
+        while i < self.count:
+            xs[i] += dxs[i]
+            ys[i] += dys[i]
+            if xs[i] > limit:
+                self.remove(i)
+            else:
+                i += 1
+    
+    def draw(self):
+        draw_bullets(thumby.display.display.buffer, self.x, self.y, self.count, FP_SHIFT)
+
+class SpatialGrid:
+    """Uniform broadphase grid of 8px cells over the screen.
+
+    Items are filed under the cell of their top-left corner, and items
+    wider than a cell once more every 8px across. A shape no bigger than a
+    cell at a query point can then only touch items filed in the 3x3 block
+    of cells around it. The grid is kept as per-column and per-row bitmasks
+    of item ids; after build() has spread each mask to its neighbours, a
+    query is two lookups and an AND: bit i of the result is set when item i
+    may be within reach. Ids are indices into the caller's list and must be
+    below GRID_MAX_ITEMS.
+    """
+    
+    def __init__(self):
+        self.item_cols = array('H', [0] * GRID_COLS)
+        self.item_rows = array('H', [0] * GRID_ROWS)
+        self.cols = array('H', self.item_cols)
+        self.rows = array('H', self.item_rows)
+        self.empty_cols = array('H', self.item_cols)
+        self.empty_rows = array('H', self.item_rows)
+    
+    def clear(self):
+        self.item_cols[:] = self.empty_cols
+        self.item_rows[:] = self.empty_rows
+    
+    def insert(self, item, x, y, width=8):
+        row = y >> 3
+        row = 0 if row < 0 else (GRID_ROWS - 1 if row >= GRID_ROWS else row)
+        self.item_rows[row] |= 1 << item
+        for x in range(x, x + width, 8):
+            col = x >> 3
+            col = 0 if col < 0 else (GRID_COLS - 1 if col >= GRID_COLS else col)
+            self.item_cols[col] |= 1 << item
+    
+    def build(self):
+        for src, dst, n in ((self.item_cols, self.cols, GRID_COLS), 
+                            (self.item_rows, self.rows, GRID_ROWS)):
+            prev = 0
+            here = src[0]
+            for i in range(n - 1):
+                after = src[i + 1]
+                dst[i] = prev | here | after
+                prev = here
+                here = after
+            dst[n - 1] = prev | here
+    
+    def query(self, x, y):
+        col = x >> 3
+        row = y >> 3
+        col = 0 if col < 0 else (GRID_COLS - 1 if col >= GRID_COLS else col)
+        row = 0 if row < 0 else (GRID_ROWS - 1 if row >= GRID_ROWS else row)
+        return self.cols[col] & self.rows[row]
+    
+    def query_box(self, x, y, width, height):
+        """Like query(), for a box bigger than a cell: queries points 16px apart across it."""
+        found = 0
+        qy = y + 1
+        while True:
+            qx = x + 1
+            while True:
+                found |= self.query(qx, qy)
+                if qx + 8 >= x + width - 1:
+                    break
+                qx += 16
+            if qy + 8 >= y + height - 1:
+                break
+            qy += 16
+        return found
+
+class HudWidget:
+    """A HUD strip whose pixels are cached and only re-rasterized when its key changes.
+
+    The strip covers whole display pages so it can be copied out of the
+    framebuffer byte by byte. On a change the caller draws into a cleared
+    strip between stale() and capture(); draw() blits the cached pixels with
+    black as transparent, the same as drawing the primitives over the game.
+    """
+    __slots__ = ('x', 'page', 'width', 'pages', 'key', 'pixels', 'saved')
+    
+    def __init__(self, x, page, width, pages):
+        self.x = x
+        self.page = page
+        self.width = width
+        self.pages = pages
+        self.key = -1
+        self.pixels = bytearray(width * pages)
+        self.saved = bytearray(width * pages)
+    
+    def stale(self, key):
+        """Return True, with the strip saved and cleared, if key changed."""
+        if key == self.key:
+            return False
+        self.key = key
+        buf = memoryview(thumby.display.display.buffer)
+        width = self.width
+        for p in range(self.pages):
+            a = (self.page + p) * SCREEN_WIDTH + self.x
+            self.saved[p * width:(p + 1) * width] = buf[a:a + width]
+            buf[a:a + width] = bytes(width)
+        return True
+    
+    def capture(self):
+        buf = memoryview(thumby.display.display.buffer)
+        width = self.width
+        for p in range(self.pages):
+            a = (self.page + p) * SCREEN_WIDTH + self.x
+            self.pixels[p * width:(p + 1) * width] = buf[a:a + width]
+            buf[a:a + width] = self.saved[p * width:(p + 1) * width]
+    
+    def draw(self):
+        thumby.display.blit(self.pixels, self.x, self.page << 3, self.width, self.pages << 3, 0, 0, 0)
+
+class FrameScheduler:
+    """Fixed-timestep pacing for game_loop.
+
+    advance() waits until a render's worth of simulation time has passed
+    on ticks_us and returns how many fixed steps are due. When a frame
+    runs long the extra steps are simulated without rendering, up to
+    max_skip renders in a row; beyond that the backlog is dropped.
+    """
+    __slots__ = ('step_us', 'render_every', 'max_skip', 'paced', 'last_us', 'accumulator',
+                 'steps', 'renders', 'late_frames', 'skipped_renders')
+    
+    def __init__(self, rate=FPS, render_every=RENDER_EVERY, max_skip=MAX_FRAME_SKIP):
+        self.step_us = 1000000 // rate
+        self.render_every = render_every
+        self.max_skip = max_skip
+        self.paced = True  # False: no waiting, one render's steps per call (replays)
+        self.reset()
+    
+    def reset(self):
+        self.last_us = ticks_us()
+        self.accumulator = 0
+        self.steps = 0
+        self.renders = 0
+        self.late_frames = 0
+        self.skipped_renders = 0
+    
+    def advance(self):
+        if not self.paced:
+            self.steps += self.render_every
+            self.renders += 1
+            return self.render_every
+        step_us = self.step_us
+        frame_us = step_us * self.render_every
+        elapsed = self.accumulator + ticks_diff(ticks_us(), self.last_us)
+        if elapsed < frame_us:
+            sleep_us(frame_us - elapsed)
+        now = ticks_us()
+        elapsed = self.accumulator + ticks_diff(now, self.last_us)
+        self.last_us = now
+        
+        steps = elapsed // step_us
+        if steps > self.render_every:
+            self.late_frames += 1
+            limit = self.render_every * (self.max_skip + 1)
+            if steps > limit:
+                elapsed -= (steps - limit) * step_us
+                steps = limit
+            self.skipped_renders += steps // self.render_every - 1
+        self.accumulator = elapsed - steps * step_us
+        self.steps += steps
+        self.renders += 1
+        return steps
+    
+    def spare_us(self):
+        """Microseconds left before the next render is due."""
+        frame_us = self.step_us * self.render_every
+        if not self.paced:
+            return frame_us
+        return frame_us - self.accumulator - ticks_diff(ticks_us(), self.last_us)
 
 class GameState:
-    __slots__ = ('score', 'high_score', 'lives', 'level', 'charge', 'shield_active',
+    __slots__ = ('score', 'high_score', 'high_scores', 'lives', 'level', 'charge', 'shield_active',
                 'shield_power', 'upgrades', 'powerups', 'boss_active', 'shake_frames',
                 'flash_frames', 'credits', 'combo', 'combo_timer', 'current_powerup',
                 'score_multiplier', 'wave_number', 'wave_enemies', 'wave_announcement_timer',
                 'floating_texts', 'heat_level', 'overheated', 'machine_gun_timer')
     
     def __init__(self):
+        # Progress kept across games and saved by SaveStore; reset() leaves it alone
+        self.high_score = 0
+        self.high_scores = [0] * TOP_SCORES
+        self.credits = 0
+        self.upgrades = {'speed': 0, 'power': 0, 'shield': 0}
         self.reset()
     
     def reset(self):
         self.score = 0
-        self.high_score = 0
         self.lives = 3
         self.level = 1
         self.charge = 0
         self.shield_active = False
         self.shield_power = 100
-        self.upgrades = {'speed': 0, 'power': 0, 'shield': 0}
         self.powerups = []
         self.boss_active = False
         self.shake_frames = 0
         self.flash_frames = 0
-        self.credits = 0
         self.combo = 0
         self.combo_timer = 0
         self.current_powerup = None
         self.score_multiplier = 1
-        self.wave_number = 1
+        self.wave_number = 0  # start_new_wave moves to wave 1
         self.wave_enemies = 0
         self.wave_announcement_timer = 0
         self.floating_texts = []
@@ -136,6 +507,16 @@ class GameState:
         self.overheated = False
         self.machine_gun_timer = 0
     
+    def record_score(self):
+        """Enter this game's score in the high score table if it makes it."""
+        scores = self.high_scores
+        for i in range(TOP_SCORES):
+            if self.score > scores[i]:
+                scores.insert(i, self.score)
+                scores.pop()
+                break
+        self.high_score = scores[0]
+    
     def update_combo(self):
         if self.combo_timer > 0:
             self.combo_timer -= 1
@@ -146,30 +527,38 @@ class GameState:
 class NovaNaut:
     def __init__(self):
         self.state = GameState()
-        self.particles = ParticleSystem()
-        self.title_flash_timer = 0
-        self.setup_game()
-        thumby.display.setFPS(FPS)
-    
-    def setup_game(self):
-        self.setup_sprites()
-        self.setup_stars()
-    
-    def setup_sprites(self):
-        self.player = thumby.Sprite(13, 11, playerMap)
-        self.player.x = 5
-        self.player.y = SCREEN_HEIGHT // 2
-        self.bullets = []
-        self.aliens = []
-        self.player_velocity = {'x': 0, 'y': 0}
-        self.powerups = []
-    
-    def __init__(self):
-        self.state = GameState()
-        self.particles = ParticleSystem()
+        self.rng = Rng()  # Gameplay: power-up drops
+        self.fx = Rng()  # Cosmetic: stars, flash masks and the noise table
+        self.noise = RandomTable()
+        self.noise.fill(self.fx)
+        self.particles = ParticleSystem(self.noise)
         self.title_flash_timer = 0
         self.player = None
-        self.bullets = []
+        self.bullets = BulletPool()
+        self.alien_grid = SpatialGrid()
+        self.powerup_grid = SpatialGrid()
+        self.scheduler = FrameScheduler()
+        self.profiler = Profiler(PROFILE_STAGES)
+        self.gc_policy = GcPolicy(strict=GC_STRICT)
+        self.audio = AudioMixer()
+        self.input = InputLog()
+        self.render = True  # False: game_loop skips draw(), for replays
+        self.schedule = SpawnSchedule()
+        self.level_seed = 0
+        self.save = SaveStore(SAVE_PATH)
+        if self.save.load():
+            self.save.apply(self.state)
+        # Per-alien lists of candidate bullets, filled by check_collisions
+        self.alien_hits = array('h', [0] * (MAX_ALIENS * BULLET_CAPACITY))
+        self.alien_hit_counts = array('h', [0] * MAX_ALIENS)
+        # Retained HUD strips: (x, first page, width, pages)
+        self.hud_top = HudWidget(0, 0, SCREEN_WIDTH, 1)
+        self.hud_bottom = HudWidget(0, 4, SCREEN_WIDTH, 1)
+        self.hud_combo = HudWidget(SCREEN_WIDTH - 24, 1, 24, 2)
+        self.hud_powerup = HudWidget(0, 1, 16, 2)
+        self.hud_heat = HudWidget(0, 1, 24, 4)
+        self.hud_charge = HudWidget(26, 4, 20, 1)
+        self.shake_buffer = bytearray(SCREEN_WIDTH * SCREEN_HEIGHT // 8)
         self.aliens = []
         self.stars = []
         self.powerups = []
@@ -178,69 +567,43 @@ class NovaNaut:
         self.max_aliens = 5
         thumby.display.setFPS(FPS)
         self.setup_game()
+        self.setup_flash_masks()
     
     def setup_game(self):
         self.setup_sprites()
         self.setup_stars()
         # Reset all game-specific lists
-        self.bullets = []
+        self.bullets.clear()
         self.aliens = []
         self.powerups = []
         self.floating_texts = []
         self.player_velocity = {'x': 0, 'y': 0}
     
     def setup_sprites(self):
-        self.player = thumby.Sprite(13, 11, playerMap)
+        self.player = SPRITE_SHEET.sprite('player')
         self.player.x = 5
         self.player.y = SCREEN_HEIGHT // 2
+        self.player_pos = {'x': self.player.x << PLAYER_SHIFT, 'y': self.player.y << PLAYER_SHIFT}
     
-    def update_floating_texts(self):
-        i = len(self.floating_texts) - 1
-        while i >= 0:
-            text = self.floating_texts[i]
-            text['y'] += text['dy']
-            text['timer'] -= 1
-            if text['timer'] <= 0:
-                self.floating_texts.pop(i)
-            i -= 1
+    def reset_game_state(self, seed=None):
+        """Reset all game-related state when starting a new game.
 
-    def handle_alien_destroyed(self, alien):
-        points = 20 if alien['type'] == 'elite' else 10
-        
-        self.state.combo = min(self.state.combo + 1, MAX_COMBO)
-        self.state.combo_timer = COMBO_TIMEOUT
-        self.state.score_multiplier = 1 + (self.state.combo * 0.2)
-        
-        final_points = int(points * self.state.score_multiplier)
-        self.state.score += final_points
-        
-        # Add new floating text
-        if not hasattr(self, 'floating_texts'):
-            self.floating_texts = []
-        
-        self.floating_texts.append({
-            'text': f'+{final_points}',
-            'x': alien['x'],
-            'y': alien['y'],
-            'timer': 30,
-            'dy': -0.5
-        })
-        
-        self.state.credits += 1
-        self.spawn_powerup(alien['x'], alien['y'])
-        self.particles.emit(alien['x'] + 4, alien['y'] + 4, 10)
-        self.aliens.remove(alien)
-        self.state.shake_frames = 5
-        thumby.audio.play(200, 100)
-
-    def reset_game_state(self):
-        """Reset all game-related state when starting a new game"""
+        The seed decides the waves and power-up drops; the same seed
+        replays the same game. None picks one at random.
+        """
         self.state.reset()
-        self.bullets = []
+        self.bullets.clear()
         self.aliens = []
         self.powerups = []
         self.floating_texts = []
         self.player_velocity = {'x': 0, 'y': 0}
+        self.schedule.clear()
+        if seed is None:
+            seed = random.getrandbits(16)
+        self.level_seed = seed
+        self.rng.seed(seed)
+        self.fx.seed(seed ^ FX_SALT)
+        self.noise.fill(self.fx)
         self.setup_game()
 
     def run(self):
@@ -249,22 +612,33 @@ class NovaNaut:
             
             if action == "START":
                 self.reset_game_state()  # Use new reset method
+                if RECORD_INPUT:
+                    self.input.start_recording(self.level_seed, self.state.upgrades)
                 self.game_loop()
+                self.input.stop()
                 self.show_game_over()
+                if RECORD_INPUT:
+                    self.input.save(REPLAY_PATH)
             elif action == "UPGRADE":
                 self.show_upgrade_menu()
             elif action == "SCORES":
                 self.show_scores()
     
     def setup_stars(self):
+        # Each layer is rendered once into a bitmap two screens wide holding
+        # the same star field twice, so any scroll offset is one blit.
+        # star_offsets holds each layer's fixed-point scroll.
         self.stars = []
+        self.star_offsets = array('h', [0] * STAR_LAYERS)
         for layer in range(STAR_LAYERS):
-            speed = (layer + 1) * 0.5
-            self.stars.append([{
-                'x': random.randint(0, SCREEN_WIDTH),
-                'y': random.randint(0, SCREEN_HEIGHT),
-                'speed': speed
-            } for _ in range(10 - layer * 2)])
+            bitmap = bytearray(SCREEN_WIDTH * 2 * SCREEN_HEIGHT // 8)
+            for _ in range(10 - layer * 2):
+                x = self.fx.below(SCREEN_WIDTH)
+                y = self.fx.below(SCREEN_HEIGHT)
+                i = (y >> 3) * SCREEN_WIDTH * 2 + x
+                bitmap[i] |= 1 << (y & 7)
+                bitmap[i + SCREEN_WIDTH] |= 1 << (y & 7)
+            self.stars.append(bitmap)
 
     def update_heat(self):
         if self.state.overheated:
@@ -275,31 +649,36 @@ class NovaNaut:
             self.state.heat_level = max(0, self.state.heat_level - COOLING_RATE)
 
     def handle_input(self):
-        accel = 0.2 + (self.state.upgrades['speed'] * 0.1)
-        max_speed = 2 + (self.state.upgrades['speed'] * 0.5)
+        if FIXED_POINT:
+            accel = (PLAYER_ONE * (2 + self.state.upgrades['speed']) + 5) // 10
+            max_speed = (PLAYER_ONE * (4 + self.state.upgrades['speed'])) >> 1
+        else:
+            accel = 0.2 + (self.state.upgrades['speed'] * 0.1)
+            max_speed = 2 + (self.state.upgrades['speed'] * 0.5)
         
         # Movement input
-        if thumby.buttonU.pressed():
+        buttons = self.input.read()
+        if buttons & BTN_U:
             self.player_velocity['y'] = max(-max_speed, self.player_velocity['y'] - accel)
-        elif thumby.buttonD.pressed():
+        elif buttons & BTN_D:
             self.player_velocity['y'] = min(max_speed, self.player_velocity['y'] + accel)
         else:
-            self.player_velocity['y'] *= 0.9
+            self.player_velocity['y'] = damp(self.player_velocity['y'])
             
-        if thumby.buttonL.pressed():
+        if buttons & BTN_L:
             self.player_velocity['x'] = max(-max_speed, self.player_velocity['x'] - accel)
-        elif thumby.buttonR.pressed():
+        elif buttons & BTN_R:
             self.player_velocity['x'] = min(max_speed, self.player_velocity['x'] + accel)
         else:
-            self.player_velocity['x'] *= 0.9
+            self.player_velocity['x'] = damp(self.player_velocity['x'])
         
         # Weapon input
-        if thumby.buttonA.pressed():
+        if buttons & BTN_A:
             self.state.charge = min(self.state.charge + 1, MAX_CHARGE)
         elif self.state.charge > 0:
             self.fire_bullet(charged=True)
             self.state.charge = 0
-        elif thumby.buttonB.pressed() and not self.state.overheated:
+        elif buttons & BTN_B and not self.state.overheated:
             if self.state.machine_gun_timer <= 0:
                 if self.state.heat_level < MACHINE_GUN_HEAT_MAX:
                     self.fire_bullet()
@@ -308,14 +687,15 @@ class NovaNaut:
                     
                     if self.state.heat_level >= MACHINE_GUN_HEAT_MAX:
                         self.state.overheated = True
-                        thumby.audio.play(100, 100)
+                        self.audio.play(SND_OVERHEAT)
         
         if self.state.machine_gun_timer > 0:
             self.state.machine_gun_timer -= 1
 
     def spawn_powerup(self, x, y):
-        if random.random() < POWER_UP_CHANCE:
-            powerup_type = random.choice(POWERUP_TYPES)
+        rng = self.rng
+        if rng.bits(8) < POWER_UP_CHANCE and len(self.powerups) < MAX_FIELD_POWERUPS:
+            powerup_type = rng.choice(POWERUP_TYPES)
             self.powerups.append(PowerUp(powerup_type, x, y))
 
     def update_powerups(self):
@@ -323,23 +703,45 @@ class NovaNaut:
             if self.state.current_powerup.update():
                 self.state.current_powerup = None
         
-        for powerup in self.powerups[:]:
-            if (abs(self.player.x + 6 - powerup.x) < 8 and 
-                abs(self.player.y + 5 - powerup.y) < 8):
-                powerup.collect()
-                self.state.current_powerup = powerup
-                self.powerups.remove(powerup)
-                thumby.audio.play(1200, 50)
+        grid = self.powerup_grid
+        grid.clear()
+        for i in range(len(self.powerups)):
+            powerup = self.powerups[i]
+            grid.insert(i, int(powerup.x), int(powerup.y))
+        grid.build()
+        
+        player_x = int(self.player.x)
+        player_y = int(self.player.y)
+        candidates = grid.query_box(player_x + PLAYER_MASK.x, player_y + PLAYER_MASK.y,
+                                    PLAYER_MASK.width, PLAYER_MASK.height)
+        i = 0
+        removed = 0
+        while candidates:
+            if candidates & 1:
+                powerup = self.powerups[i - removed]
+                if hit(PLAYER_MASK, player_x, player_y, 
+                       POWERUP_MASK, int(powerup.x), int(powerup.y)):
+                    powerup.collect()
+                    self.state.current_powerup = powerup
+                    self.powerups.remove(powerup)
+                    removed += 1
+                    self.audio.play(SND_POWERUP)
+            candidates >>= 1
+            i += 1
 
     def update_floating_texts(self):
-        for text in self.floating_texts[:]:
+        texts = self.floating_texts
+        i = len(texts) - 1
+        while i >= 0:
+            text = texts[i]
             text['y'] += text['dy']
             text['timer'] -= 1
             if text['timer'] <= 0:
-                self.floating_texts.remove(text)
+                texts.pop(i)
+            i -= 1
 
     def handle_alien_destroyed(self, alien):
-        points = 20 if alien['type'] == 'elite' else 10
+        points = ALIEN_POINTS[alien.type]
         
         self.state.combo = min(self.state.combo + 1, MAX_COMBO)
         self.state.combo_timer = COMBO_TIMEOUT
@@ -350,30 +752,46 @@ class NovaNaut:
         
         self.floating_texts.append({
             'text': f'+{final_points}',
-            'x': alien['x'],
-            'y': alien['y'],
+            'x': int(alien.x),
+            'y': alien.y << FP_SHIFT if FIXED_POINT else alien.y,
             'timer': 30,
-            'dy': -0.5
+            'dy': -(FP_ONE >> 1) if FIXED_POINT else -0.5
         })
         
         self.state.credits += 1
-        self.spawn_powerup(alien['x'], alien['y'])
-        self.particles.emit(alien['x'] + 4, alien['y'] + 4, 10)
+        self.spawn_powerup(alien.x, alien.y)
+        center = ALIEN_WIDTH[alien.type] >> 1
+        self.particles.emit(alien.x + center, alien.y + 4, 10)
         self.aliens.remove(alien)
+        if alien.type == ALIEN_BOSS:
+            self.state.boss_active = False
         self.state.shake_frames = 5
-        thumby.audio.play(200, 100)
+        self.audio.play(SND_KILL)
 
     def handle_player_hit(self):
         if not self.state.shield_active:
             self.state.lives -= 1
             self.state.flash_frames = FLASH_INTERVAL
             self.state.shake_frames = SHAKE_DURATION
-            thumby.audio.play(100, 200)
+            self.audio.play(SND_HIT)
 
     def update_player_position(self):
         speed_multiplier = 1.5 if (self.state.current_powerup and 
                                  self.state.current_powerup.type == 'SPEED') else 1.0
         
+        if FIXED_POINT:
+            dx = self.player_velocity['x']
+            dy = self.player_velocity['y']
+            if speed_multiplier > 1:
+                dx += dx >> 1
+                dy += dy >> 1
+            pos = self.player_pos
+            pos['x'] = max(0, min((SCREEN_WIDTH - 13) << PLAYER_SHIFT, pos['x'] + dx))
+            pos['y'] = max(0, min((SCREEN_HEIGHT - 11) << PLAYER_SHIFT, pos['y'] + dy))
+            self.player.x = pos['x'] >> PLAYER_SHIFT
+            self.player.y = pos['y'] >> PLAYER_SHIFT
+            return
+        
         self.player.x += self.player_velocity['x'] * speed_multiplier
         self.player.y += self.player_velocity['y'] * speed_multiplier
         
@@ -381,67 +799,138 @@ class NovaNaut:
         self.player.y = max(0, min(SCREEN_HEIGHT - 11, self.player.y))
 
     def update_stars(self):
-        for layer in self.stars:
-            for star in layer:
-                star['x'] -= star['speed']
-                if star['x'] < 0:
-                    star['x'] = SCREEN_WIDTH
-                    star['y'] = random.randint(0, SCREEN_HEIGHT)
+        wrap = SCREEN_WIDTH << FP_SHIFT
+        for layer in range(STAR_LAYERS):
+            offset = self.star_offsets[layer] + (layer + 1) * FP_ONE // 2
+            self.star_offsets[layer] = offset - wrap if offset >= wrap else offset
+
+    def spawn_alien(self, alien_type, y):
+        alien = Alien(alien_type, SCREEN_WIDTH, y)
+        self.aliens.append(alien)
+        return alien
 
     def update_aliens(self):
-        if len(self.aliens) < self.max_aliens and self.state.wave_enemies > 0 and random.random() < 0.02:
-            alien_type = random.choice(['basic', 'scout', 'elite']) if random.random() > 0.8 else 'basic'
-            self.aliens.append({
-                'sprite': thumby.Sprite(8, 8, alienMaps[alien_type]),
-                'type': alien_type,
-                'health': 2 if alien_type == 'elite' else 1,
-                'x': SCREEN_WIDTH,
-                'y': random.randint(0, SCREEN_HEIGHT - 8)
-            })
+        # An entry that is due but blocked by max_aliens spawns on a later frame
+        schedule = self.schedule
+        if schedule.due() and len(self.aliens) < self.max_aliens and self.state.wave_enemies > 0:
+            i = schedule.next
+            schedule.next = i + 1
+            alien_type = schedule.types[i]
+            self.spawn_alien(alien_type, schedule.ys[i])
+            if alien_type == ALIEN_BOSS:
+                self.state.boss_active = True
             self.state.wave_enemies -= 1
         
-        for alien in self.aliens[:]:
-            speed = 1.5 if alien['type'] == 'scout' else 1
-            alien['x'] -= speed
-            if alien['x'] < -8:
-                self.aliens.remove(alien)
+        i = len(self.aliens) - 1
+        while i >= 0:
+            alien = self.aliens[i]
+            if alien.type == ALIEN_BOSS and alien.x <= BOSS_HOLD_X:
+                pass
+            elif FIXED_POINT:
+                alien.fx -= ALIEN_SPEED_FP[alien.type]
+                alien.x = alien.fx >> FP_SHIFT
+            else:
+                alien.x -= ALIEN_SPEED[alien.type]
+            if alien.x < -ALIEN_WIDTH[alien.type]:
+                self.aliens.pop(i)
+            i -= 1
 
     def update_bullets(self):
-        for bullet in self.bullets[:]:
-            bullet['x'] += bullet['dx']
-            bullet['y'] += bullet['dy']
-            if bullet['x'] > SCREEN_WIDTH:
-                self.bullets.remove(bullet)
+        self.bullets.update()
 
     def check_collisions(self):
-        for alien in self.aliens[:]:
-            for bullet in self.bullets[:]:
-                if (abs(alien['x'] - bullet['x']) < 8 and 
-                    abs(alien['y'] - bullet['y']) < 8):
-                    alien['health'] -= bullet['power']
-                    self.bullets.remove(bullet)
-                    if alien['health'] <= 0:
+        aliens = self.aliens
+        grid = self.alien_grid
+        grid.clear()
+        for i in range(len(aliens)):
+            alien = aliens[i]
+            grid.insert(i, int(alien.x), alien.y, ALIEN_WIDTH[alien.type])
+        grid.build()
+        player_candidates = grid.query_box(int(self.player.x) + PLAYER_MASK.x,
+                                           int(self.player.y) + PLAYER_MASK.y,
+                                           PLAYER_MASK.width, PLAYER_MASK.height)
+        
+        # Broadphase: file each bullet under every alien whose cell block it
+        # falls in. Bullets are visited in pool order, so each alien's list is
+        # in the same order a full scan would see them.
+        bullets = self.bullets
+        bullet_x, bullet_y, bullet_power = bullets.x, bullets.y, bullets.power
+        cols, rows = grid.cols, grid.rows
+        hits, hit_counts = self.alien_hits, self.alien_hit_counts
+        for j in range(MAX_ALIENS):
+            hit_counts[j] = 0
+        shift = FP_SHIFT + 3
+        for i in range(bullets.count):
+            col = bullet_x[i] >> shift
+            row = bullet_y[i] >> shift
+            if 0 <= col < GRID_COLS and 0 <= row < GRID_ROWS:
+                candidates = cols[col] & rows[row]
+            else:
+                candidates = grid.query(bullet_x[i] >> FP_SHIFT, bullet_y[i] >> FP_SHIFT)
+            j = 0
+            while candidates:
+                if candidates & 1:
+                    hits[j * BULLET_CAPACITY + hit_counts[j]] = i
+                    hit_counts[j] += 1
+                candidates >>= 1
+                j += 1
+        
+        # Narrowphase, alien by alien. Spent bullets are only zeroed here and
+        # compacted afterwards so the candidate indices stay valid.
+        removed = 0
+        for j in range(len(aliens)):
+            alien = aliens[j - removed]
+            alien_x = int(alien.x)
+            alien_y = alien.y
+            mask = ALIEN_MASKS[alien.type]
+            base = j * BULLET_CAPACITY
+            for k in range(base, base + hit_counts[j]):
+                i = hits[k]
+                if (bullet_power[i] and 
+                    hit(mask, alien_x, alien_y, 
+                        BULLET_MASK, bullet_x[i] >> FP_SHIFT, bullet_y[i] >> FP_SHIFT)):
+                    alien.health -= bullet_power[i]
+                    bullet_power[i] = 0
+                    if alien.health <= 0:
                         self.handle_alien_destroyed(alien)
+                        removed += 1
                         break
-            
-            if (abs(self.player.x + 6 - (alien['x'] + 4)) < 8 and 
-                abs(self.player.y + 5 - (alien['y'] + 4)) < 8):
-                if self.state.shield_active:
-                    self.state.shield_power -= 25
-                    if self.state.shield_power <= 0:
-                        self.state.shield_active = False
-                    self.aliens.remove(alien)
-                else:
-                    self.handle_player_hit()
-                    self.aliens.remove(alien)
+            else:
+                if (player_candidates >> j) & 1 and self.check_player_alien(alien):
+                    removed += 1
+        bullets.remove_spent()
+
+    def check_player_alien(self, alien):
+        if hit(PLAYER_MASK, int(self.player.x), int(self.player.y), 
+               ALIEN_MASKS[alien.type], int(alien.x), alien.y):
+            if self.state.shield_active:
+                self.state.shield_power -= 25
+                if self.state.shield_power <= 0:
+                    self.state.shield_active = False
+                self.aliens.remove(alien)
+            else:
+                self.handle_player_hit()
+                self.aliens.remove(alien)
+            if alien.type == ALIEN_BOSS:
+                self.state.boss_active = False
+            return True
+        return False
 
     def update(self):
+        profiler = self.profiler
+        profiler.mark()
         self.update_player_position()
+        profiler.lap(PROF_PLAYER)
         self.update_bullets()
+        profiler.lap(PROF_BULLETS)
         self.update_aliens()
+        profiler.lap(PROF_ALIENS)
         self.particles.update()
+        profiler.lap(PROF_PARTICLES)
         self.update_stars()
+        profiler.lap(PROF_STARS)
         self.check_collisions()
+        profiler.lap(PROF_COLLISIONS)
         self.state.update_combo()
         self.update_powerups()
         self.update_floating_texts()
@@ -469,52 +958,58 @@ class NovaNaut:
                 thumby.display.drawText("2", x + 1, y + 1, 0)
 
     def draw_powerup_indicator(self):
-        if self.state.current_powerup:
-            icon_x, icon_y = 2, 12
-            if self.state.current_powerup.type == 'SPEED':
-                thumby.display.drawLine(icon_x, icon_y + 3, icon_x + 5, icon_y + 3, 1)
-                thumby.display.drawLine(icon_x + 3, icon_y + 1, icon_x + 5, icon_y + 3, 1)
-                thumby.display.drawLine(icon_x + 3, icon_y + 5, icon_x + 5, icon_y + 3, 1)
-            elif self.state.current_powerup.type == 'SHIELD':
-                thumby.display.drawRectangle(icon_x + 1, icon_y + 1, 4, 4, 1)
-            elif self.state.current_powerup.type == 'MULTI':
-                thumby.display.drawText("×2", icon_x, icon_y, 1)
-            
-            bar_width = int((self.state.current_powerup.timer / POWERUP_DURATION) * 10)
-            thumby.display.drawRectangle(icon_x, icon_y + 6, 10, 2, 1)
-            thumby.display.drawFilledRectangle(icon_x, icon_y + 6, bar_width, 2, 1)
+        powerup = self.state.current_powerup
+        if powerup:
+            bar_width = powerup.timer * 10 // POWERUP_DURATION
+            widget = self.hud_powerup
+            if widget.stale(POWERUP_TYPES.index(powerup.type) * 16 + bar_width):
+                icon_x, icon_y = 2, 12
+                if powerup.type == 'SPEED':
+                    thumby.display.drawLine(icon_x, icon_y + 3, icon_x + 5, icon_y + 3, 1)
+                    thumby.display.drawLine(icon_x + 3, icon_y + 1, icon_x + 5, icon_y + 3, 1)
+                    thumby.display.drawLine(icon_x + 3, icon_y + 5, icon_x + 5, icon_y + 3, 1)
+                elif powerup.type == 'SHIELD':
+                    thumby.display.drawRectangle(icon_x + 1, icon_y + 1, 4, 4, 1)
+                elif powerup.type == 'MULTI':
+                    thumby.display.drawText("×2", icon_x, icon_y, 1)
+                
+                thumby.display.drawRectangle(icon_x, icon_y + 6, 10, 2, 1)
+                thumby.display.drawFilledRectangle(icon_x, icon_y + 6, bar_width, 2, 1)
+                widget.capture()
+            widget.draw()
 
     def draw_shield(self):
         if self.state.shield_active:
-            t = time.ticks_ms() / 200
-            radius = 8
-            segments = 8
-            center_x = self.player.x + 6
-            center_y = self.player.y + 5
+            center_x = int(self.player.x) + 6
+            center_y = int(self.player.y) + 5
+            base = (ticks_ms() // SHIELD_STEP_MS) % SHIELD_PHASES * SHIELD_SEGMENTS
             
-            for i in range(segments):
-                angle = (i / segments) * 2 * math.pi
-                next_angle = ((i + 1) / segments) * 2 * math.pi
-                
-                x1 = int(center_x + math.cos(angle + t) * radius)
-                y1 = int(center_y + math.sin(angle + t) * radius)
-                x2 = int(center_x + math.cos(next_angle + t) * radius)
-                y2 = int(center_y + math.sin(next_angle + t) * radius)
-                
+            # Walk the ring from the last vertex round to it again
+            x1 = center_x + SHIELD_X[base + SHIELD_SEGMENTS - 1]
+            y1 = center_y + SHIELD_Y[base + SHIELD_SEGMENTS - 1]
+            for i in range(base, base + SHIELD_SEGMENTS):
+                x2 = center_x + SHIELD_X[i]
+                y2 = center_y + SHIELD_Y[i]
                 if (0 <= x1 < SCREEN_WIDTH and 0 <= y1 < SCREEN_HEIGHT and
                     0 <= x2 < SCREEN_WIDTH and 0 <= y2 < SCREEN_HEIGHT):
                     thumby.display.drawLine(x1, y1, x2, y2, 1)
+                x1 = x2
+                y1 = y2
 
     def draw_combo_indicator(self):
         if self.state.combo > 1:
-            text = f"{self.state.combo}x"
-            x = SCREEN_WIDTH - len(text) * 6 - 2
-            y = 10
-            thumby.display.drawText(text, x, y, 1)
-            
-            bar_width = int((self.state.combo_timer / COMBO_TIMEOUT) * 10)
-            thumby.display.drawRectangle(x, y + 8, 10, 2, 1)
-            thumby.display.drawFilledRectangle(x, y + 8, bar_width, 2, 1)
+            bar_width = self.state.combo_timer * 10 // COMBO_TIMEOUT
+            widget = self.hud_combo
+            if widget.stale(self.state.combo * 16 + bar_width):
+                text = f"{self.state.combo}x"
+                x = SCREEN_WIDTH - len(text) * 6 - 2
+                y = 10
+                thumby.display.drawText(text, x, y, 1)
+                
+                thumby.display.drawRectangle(x, y + 8, 10, 2, 1)
+                thumby.display.drawFilledRectangle(x, y + 8, bar_width, 2, 1)
+                widget.capture()
+            widget.draw()
 
     def draw_wave_announcement(self):
         if self.state.wave_announcement_timer > 0:
@@ -525,339 +1020,293 @@ class NovaNaut:
 
     def draw_floating_texts(self):
         for text in self.floating_texts:
-            x = int(text['x'])
-            y = int(text['y'])
+            x = text['x']
+            y = text['y'] >> FP_SHIFT if FIXED_POINT else int(text['y'])
             if 0 <= x < SCREEN_WIDTH and 0 <= y < SCREEN_HEIGHT:
                 thumby.display.drawText(text['text'], x, y, 1)
 
     def draw_stars(self):
-        shake_x = random.randint(-SHAKE_INTENSITY, SHAKE_INTENSITY) if self.state.shake_frames > 0 else 0
-        shake_y = random.randint(-SHAKE_INTENSITY, SHAKE_INTENSITY) if self.state.shake_frames > 0 else 0
-        
-        for layer in self.stars:
-            for star in layer:
-                x = int(star['x']) + shake_x
-                y = int(star['y']) + shake_y
-                if 0 <= x < SCREEN_WIDTH and 0 <= y < SCREEN_HEIGHT:
-                    thumby.display.setPixel(x, y, 1)
+        for layer in range(STAR_LAYERS):
+            x = -(self.star_offsets[layer] >> FP_SHIFT)
+            thumby.display.blit(self.stars[layer], x, 0, 
+                                SCREEN_WIDTH * 2, SCREEN_HEIGHT, 0, 0, 0)
 
     def draw_hud(self):
-        # Score
-        score_text = str(self.state.score)
-        thumby.display.drawText(score_text, 0, 0, 1)
+        state = self.state
         
-        # Lives
-        for i in range(self.state.lives):
-            thumby.display.drawFilledRectangle(SCREEN_WIDTH - 4 - (i * 5), 0, 3, 3, 1)
+        # Score and lives
+        widget = self.hud_top
+        if widget.stale(state.score * 16 + state.lives):
+            score_text = str(state.score)
+            thumby.display.drawText(score_text, 0, 0, 1)
+            for i in range(state.lives):
+                thumby.display.drawFilledRectangle(SCREEN_WIDTH - 4 - (i * 5), 0, 3, 3, 1)
+            widget.capture()
+        widget.draw()
         
-        # Shield meter
-        if self.state.shield_active:
-            shield_width = (self.state.shield_power * 10) // 100
-            thumby.display.drawRectangle(0, SCREEN_HEIGHT - 4, 10, 3, 1)
-            thumby.display.drawFilledRectangle(0, SCREEN_HEIGHT - 4, shield_width, 3, 1)
-        
-        # Level and credits
-        level_text = f"L{self.state.level}"
-        thumby.display.drawText(level_text, SCREEN_WIDTH - 12, SCREEN_HEIGHT - 8, 1)
-        credit_text = f"C:{self.state.credits}"
-        thumby.display.drawText(credit_text, 0, SCREEN_HEIGHT - 8, 1)
+        # Shield meter, level and credits
+        shield_width = (state.shield_power * 10) // 100 if state.shield_active else 15
+        widget = self.hud_bottom
+        if widget.stale((state.credits * 16 + state.level) * 16 + shield_width):
+            if state.shield_active:
+                thumby.display.drawRectangle(0, SCREEN_HEIGHT - 4, 10, 3, 1)
+                thumby.display.drawFilledRectangle(0, SCREEN_HEIGHT - 4, shield_width, 3, 1)
+            level_text = f"L{state.level}"
+            thumby.display.drawText(level_text, SCREEN_WIDTH - 12, SCREEN_HEIGHT - 8, 1)
+            credit_text = f"C:{state.credits}"
+            thumby.display.drawText(credit_text, 0, SCREEN_HEIGHT - 8, 1)
+            widget.capture()
+        widget.draw()
 
     def draw_heat_gauge(self):
         gauge_height = 20
         gauge_y = 10
-        filled_height = int((self.state.heat_level / MACHINE_GUN_HEAT_MAX) * gauge_height)
-        
-        thumby.display.drawRectangle(2, gauge_y, 3, gauge_height, 1)
-        
-        if filled_height > 0:
-            thumby.display.drawFilledRectangle(2, gauge_y + (gauge_height - filled_height), 
-                                             3, filled_height, 1)
+        filled_height = self.state.heat_level * gauge_height // MACHINE_GUN_HEAT_MAX
+        now = ticks_ms()
+        warning = self.state.heat_level * 5 > MACHINE_GUN_HEAT_MAX * 4 and (now // 100) % 2
+        hot = self.state.overheated and (now // 200) % 2
         
-        if self.state.heat_level > MACHINE_GUN_HEAT_MAX * 0.8:
-            if (time.ticks_ms() // 100) % 2:
+        widget = self.hud_heat
+        if widget.stale(filled_height * 4 + (2 if warning else 0) + (1 if hot else 0)):
+            thumby.display.drawRectangle(2, gauge_y, 3, gauge_height, 1)
+            
+            if filled_height > 0:
+                thumby.display.drawFilledRectangle(2, gauge_y + (gauge_height - filled_height), 
+                                                 3, filled_height, 1)
+            if warning:
                 thumby.display.drawText("!", 1, gauge_y + gauge_height + 2, 1)
-
-        if self.state.overheated:
-            if (time.ticks_ms() // 200) % 2:
+            if hot:
                 thumby.display.drawText("HOT", 6, gauge_y + 8, 1)
+            widget.capture()
+        widget.draw()
+
+    def draw_profile(self):
+        # Last frame / worst frame, then two stages at a time, paging every
+        # half second. Bytes allocated follow each time when tracked.
+        profiler = self.profiler
+        first = (ticks_ms() // 500) % (profiler.stages // 2) * 2
+        lines = [
+            f"{profiler.latest(profiler.stages)}/{profiler.worst_us}",
+            f"{PROFILE_LABELS[first]} {profiler.latest(first)}",
+            f"{PROFILE_LABELS[first + 1]} {profiler.latest(first + 1)}",
+        ]
+        if profiler.track_alloc:
+            for i in range(3):
+                stage = profiler.stages if i == 0 else first + i - 1
+                lines[i] += f" {profiler.latest(stage, profiler.alloc_history)}"
+        for i, line in enumerate(lines):
+            thumby.display.drawFilledRectangle(SCREEN_WIDTH - len(line) * 6, 8 + i * 8, len(line) * 6, 8, 0)
+            thumby.display.drawText(line, SCREEN_WIDTH - len(line) * 6 + 1, 8 + i * 8, 1)
 
     def draw_charge_bar(self):
         if self.state.charge > 0:
             charge_width = (self.state.charge * 20) // MAX_CHARGE
-            thumby.display.drawRectangle(26, 36, 20, 3, 1)
-            thumby.display.drawFilledRectangle(26, 36, charge_width, 3, 1)
+            widget = self.hud_charge
+            if widget.stale(charge_width):
+                thumby.display.drawRectangle(26, 36, 20, 3, 1)
+                thumby.display.drawFilledRectangle(26, 36, charge_width, 3, 1)
+                widget.capture()
+            widget.draw()
+
+    def setup_flash_masks(self):
+        # One full-screen noise mask per flash_frames value, with as many
+        # random pixels as the per-pixel effect it replaces set on average
+        self.flash_masks = []
+        for level in range(1, FLASH_INTERVAL + 1):
+            mask = bytearray(SCREEN_WIDTH * SCREEN_HEIGHT // 8)
+            for _ in range(SCREEN_WIDTH * SCREEN_HEIGHT // 16 * level // FLASH_INTERVAL):
+                x = self.fx.below(SCREEN_WIDTH)
+                y = self.fx.below(SCREEN_HEIGHT)
+                mask[(y >> 3) * SCREEN_WIDTH + x] |= 1 << (y & 7)
+            self.flash_masks.append(mask)
 
     def draw_flash_effect(self):
         if self.state.flash_frames > 0:
-            alpha = self.state.flash_frames / FLASH_INTERVAL
-            for _ in range(SCREEN_WIDTH * SCREEN_HEIGHT // 16):
-                if random.random() < alpha:
-                    x = random.randint(0, SCREEN_WIDTH - 1)
-                    y = random.randint(0, SCREEN_HEIGHT - 1)
-                    thumby.display.setPixel(x, y, 1)
+            # OR the mask in with one blit; a random mirroring keeps the noise moving
+            mirror = self.noise.bits(2)
+            thumby.display.blit(self.flash_masks[self.state.flash_frames - 1], 0, 0,
+                                SCREEN_WIDTH, SCREEN_HEIGHT, 0, mirror & 1, mirror >> 1)
 
     def start_new_wave(self):
         self.state.wave_number += 1
         self.state.wave_announcement_timer = 60
-        self.state.wave_enemies = self.state.wave_number * 5
-        self.max_aliens = min(5 + self.state.wave_number, 8)
+        self.state.level = level_for_wave(self.state.wave_number)
+        self.schedule.compile(self.state.wave_number, self.level_seed)
+        self.state.wave_enemies = self.schedule.count
+        self.max_aliens = min(self.schedule.max_aliens, MAX_ALIENS)
+        # The announcement covers the pause of a full collection
+        self.gc_policy.collect()
 
     def check_wave_completion(self):
         if self.state.wave_enemies <= 0 and len(self.aliens) == 0:
             self.start_new_wave()
 
     def game_loop(self):
-        self.start_new_wave()  # Initialize first wave
-        while self.state.lives > 0:
-            self.handle_input()
-            self.update()
-            self.check_wave_completion()
-            self.draw()
+        gc_policy = self.gc_policy
+        scheduler = self.scheduler
+        profiler = self.profiler
+        audio = self.audio
+        replay = self.input
+        render = self.render
+        gc_policy.start()
+        # Anything raised below (GC_STRICT does on purpose) must still
+        # turn collection back on, stop the music and restore the frame rate
+        try:
+            self.start_new_wave()  # Initialize first wave
+            # The scheduler keeps time, so display.update() must not wait too
+            thumby.display.setFPS(0)
+            scheduler.reset()
+            profiler.reset()
+            audio.reset()
+            if MUSIC:
+                audio.start_music(THEME)
+            while self.state.lives > 0 and not replay.ended:
+                steps = scheduler.advance()
+                profiler.begin_frame()
+                for _ in range(steps):
+                    self.handle_input()
+                    self.update()
+                    self.check_wave_completion()
+                    audio.update()
+                    if self.state.lives <= 0 or replay.ended:
+                        break
+                if render:
+                    self.draw()
+                profiler.end_frame()
+                gc_policy.end_frame(scheduler.spare_us())
+        finally:
+            audio.stop()
+            gc_policy.stop()
+            thumby.display.setFPS(FPS)
+        if profiler.enabled:
+            profiler.dump(PROFILE_PATH)
+
+    def play_replay(self, path, render=True):
+        """Play a recorded game back through game_loop, as fast as it will run.
+
+        The player's own progress, everything GameState.reset() leaves
+        alone, is put back afterwards, so a replay earns no credits and
+        sets no scores. Returns the number of steps played, or -1 if path
+        isn't a recording.
+        """
+        replay = self.input
+        if not replay.load(path):
+            return -1
+        state = self.state
+        progress = (state.high_score, list(state.high_scores), state.credits,
+                    dict(state.upgrades))
+        self.reset_game_state(replay.seed)
+        replay.apply(state)
+        self.render = render
+        self.scheduler.paced = False
+        try:
+            self.game_loop()
+        finally:
+            self.scheduler.paced = True
+            self.render = True
+            replay.stop()
+            state.high_score, state.high_scores, state.credits, state.upgrades = progress
+        return replay.steps
+
+    def show_screen(self, name):
+        """Run a screen module's show(game) and return its result.
+
+        The module is imported on entry and dropped again on the way out,
+        so only the screen in use takes up RAM and none do during a game.
+        """
+        screen = __import__(name)
+        try:
+            return screen.show(self)
+        finally:
+            del sys.modules[name]
+            screen = None  # Drop the last reference before collecting
+            gc.collect()
 
     def show_menu(self):
-        menu_items = ["START", "UPGRADE", "SCORES"]
-        selected = 0
-        
-        while True:
-            thumby.display.fill(0)
-            
-            title = "NOVANAUT"
-            title_x = (SCREEN_WIDTH - len(title) * 6) // 2
-            self.title_flash_timer = (self.title_flash_timer + 1) % 30
-            if self.title_flash_timer < 20:
-                thumby.display.drawText(title, title_x, 4, 1)
-            
-            for i, item in enumerate(menu_items):
-                y = 15 + i * 8
-                x = (SCREEN_WIDTH - len(item) * 6) // 2
-                if i == selected:
-                    thumby.display.drawRectangle(x - 2, y - 1, len(item) * 6 + 3, 9, 1)
-                thumby.display.drawText(item, x, y, 1 if i != selected else 0)
-            
-            thumby.display.update()
-            
-            if thumby.buttonU.justPressed() and selected > 0:
-                selected -= 1
-                thumby.audio.play(800, 50)
-            elif thumby.buttonD.justPressed() and selected < len(menu_items) - 1:
-                selected += 1
-                thumby.audio.play(800, 50)
-            elif thumby.buttonA.justPressed():
-                thumby.audio.play(1000, 100)
-                return menu_items[selected]
+        return self.show_screen('nova_menu')
 
     def show_upgrade_menu(self):
-        upgrades = [
-            ("SPEED", 'speed'),
-            ("POWER", 'power'),
-            ("SHIELD", 'shield')
-        ]
-        selected = 0
-        
-        while True:
-            thumby.display.fill(0)
-            
-            thumby.display.drawText("UPGRADES", 16, 0, 1)
-            thumby.display.drawText(f"Credits: {self.state.credits}", 8, 8, 1)
-            
-            for i, (name, key) in enumerate(upgrades):
-                y = 20 + i * 8
-                level = self.state.upgrades[key]
-                cost = UPGRADE_COST * (level + 1)
-                
-                if i == selected:
-                    thumby.display.drawRectangle(0, y - 1, SCREEN_WIDTH, 9, 1)
-                
-                text = f"{name}: {level}/{MAX_UPGRADE_LEVEL} ({cost})"
-                thumby.display.drawText(text, 2, y, 1 if i != selected else 0)
-            
-            thumby.display.drawText("B:BACK", 2, SCREEN_HEIGHT - 8, 1)
-            thumby.display.update()
-            
-            if thumby.buttonU.justPressed() and selected > 0:
-                selected -= 1
-                thumby.audio.play(800, 50)
-            elif thumby.buttonD.justPressed() and selected < len(upgrades) - 1:
-                selected += 1
-                thumby.audio.play(800, 50)
-            elif thumby.buttonA.justPressed():
-                key = upgrades[selected][1]
-                level = self.state.upgrades[key]
-                cost = UPGRADE_COST * (level + 1)
-                
-                if level < MAX_UPGRADE_LEVEL and self.state.credits >= cost:
-                    self.state.credits -= cost
-                    self.state.upgrades[key] += 1
-                    thumby.audio.play(1000, 100)
-            elif thumby.buttonB.justPressed():
-                return
+        self.show_screen('nova_upgrade')
 
     def show_scores(self):
-        while True:
-            thumby.display.fill(0)
-            
-            text = "HIGH SCORE"
-            x = (SCREEN_WIDTH - len(text) * 6) // 2
-            thumby.display.drawText(text, x, 10, 1)
-            
-            score = str(self.state.high_score)
-            x = (SCREEN_WIDTH - len(score) * 6) // 2
-            thumby.display.drawText(score, x, 20, 1)
-            
-            thumby.display.drawText("B:BACK", 2, SCREEN_HEIGHT - 8, 1)
-            
-            thumby.display.update()
-            
-            if thumby.buttonB.justPressed():
-                return
+        self.show_screen('nova_scores')
 
     def show_game_over(self):
-        if self.state.score > self.state.high_score:
-            self.state.high_score = self.state.score
-        
-        while True:
-            thumby.display.fill(0)
-            
-            text = "GAME OVER"
-            x = (SCREEN_WIDTH - len(text) * 6) // 2
-            thumby.display.drawText(text, x, 8, 1)
-            
-            score_text = f"SCORE: {self.state.score}"
-            x = (SCREEN_WIDTH - len(score_text) * 6) // 2
-            thumby.display.drawText(score_text, x, 20, 1)
-            
-            hi_text = f"HIGH: {self.state.high_score}"
-            x = (SCREEN_WIDTH - len(hi_text) * 6) // 2
-            thumby.display.drawText(hi_text, x, 28, 1)
-            
-            thumby.display.drawText("B:MENU", 2, SCREEN_HEIGHT - 8, 1)
-            
-            thumby.display.update()
-            
-            if thumby.buttonB.justPressed():
-                return
+        self.show_screen('nova_gameover')
 
     def fire_bullet(self, charged=False):
-        power = 1 + (self.state.upgrades['power'] * 0.5)
+        power = 2 + self.state.upgrades['power']  # Half-hit units
         is_multi = (self.state.current_powerup and 
                    self.state.current_powerup.type == 'MULTI')
+        x = self.player.x + 11
+        y = self.player.y
         
         if charged:
             power *= 2
             if self.state.charge >= MAX_CHARGE or is_multi:
-                angles = [-15, 0, 15]
-                for angle in angles:
-                    cos_angle = math.cos(math.radians(angle))
-                    sin_angle = math.sin(math.radians(angle))
-                    self.bullets.append({
-                        'x': self.player.x + 11,
-                        'y': self.player.y + 5,
-                        'dx': cos_angle * 3,
-                        'dy': sin_angle,
-                        'power': power
-                    })
+                for i in range(len(SPREAD_DX)):
+                    self.bullets.spawn(x, y + 5, SPREAD_DX[i], SPREAD_DY[i], power)
             else:
-                self.bullets.append({
-                    'x': self.player.x + 11,
-                    'y': self.player.y + 5,
-                    'dx': 3,
-                    'dy': 0,
-                    'power': power
-                })
+                self.bullets.spawn(x, y + 5, 3 * FP_ONE, 0, power)
         else:
             if is_multi:
-                self.bullets.extend([
-                    {
-                        'x': self.player.x + 11,
-                        'y': self.player.y + 3,
-                        'dx': 2,
-                        'dy': 0,
-                        'power': power
-                    },
-                    {
-                        'x': self.player.x + 11,
-                        'y': self.player.y + 7,
-                        'dx': 2,
-                        'dy': 0,
-                        'power': power
-                    }
-                ])
+                self.bullets.spawn(x, y + 3, 2 * FP_ONE, 0, power)
+                self.bullets.spawn(x, y + 7, 2 * FP_ONE, 0, power)
             else:
-                self.bullets.append({
-                    'x': self.player.x + 11,
-                    'y': self.player.y + 5,
-                    'dx': 2,
-                    'dy': 0,
-                    'power': power
-                })
+                self.bullets.spawn(x, y + 5, 2 * FP_ONE, 0, power)
         
-        thumby.audio.play(1000 if charged else 800, 50)
+        self.audio.play(SND_CHARGED_SHOT if charged else SND_SHOT)
+
+    def apply_shake(self, dx, dy):
+        """Move everything drawn so far by (dx, dy), leaving black behind."""
+        world = self.shake_buffer
+        world[:] = thumby.display.display.buffer
+        thumby.display.fill(0)
+        thumby.display.blit(world, dx, dy, SCREEN_WIDTH, SCREEN_HEIGHT, -1, 0, 0)
 
     def draw(self):
         thumby.display.fill(0)
         
-        # Calculate shake offset once for efficiency
-        shake_x = random.randint(-SHAKE_INTENSITY, SHAKE_INTENSITY) if self.state.shake_frames > 0 else 0
-        shake_y = random.randint(-SHAKE_INTENSITY, SHAKE_INTENSITY) if self.state.shake_frames > 0 else 0
-        
-        # Draw background elements
+        # Draw the world where it is, background first
+        profiler = self.profiler
+        profiler.mark()
         self.draw_stars()
+        profiler.lap(PROF_DRAW_STARS)
         self.particles.draw()
-        
-        # Draw game elements with screen shake
-        for bullet in self.bullets:
-            x = int(bullet['x']) + shake_x
-            y = int(bullet['y']) + shake_y
-            if 0 <= x < SCREEN_WIDTH-3 and 0 <= y < SCREEN_HEIGHT-2:
-                thumby.display.drawFilledRectangle(x, y, 3, 2, 1)
-        
-        for alien in self.aliens:
-            x = int(alien['x']) + shake_x
-            y = int(alien['y']) + shake_y
-            if -8 <= x < SCREEN_WIDTH and -8 <= y < SCREEN_HEIGHT:
-                alien['sprite'].x = x
-                alien['sprite'].y = y
-                thumby.display.drawSprite(alien['sprite'])
-        
-        # Draw player with bounds checking
-        player_x = self.player.x + shake_x
-        player_y = self.player.y + shake_y
-        if -13 <= player_x < SCREEN_WIDTH and -11 <= player_y < SCREEN_HEIGHT:
-            self.player.x = player_x
-            self.player.y = player_y
-            thumby.display.drawSprite(self.player)
-            self.player.x = player_x - shake_x
-            self.player.y = player_y - shake_y
-        
-        # Draw UI elements
+        self.bullets.draw()
+        blit_aliens(thumby.display.display.buffer, self.aliens, ALIEN_BITMAPS, ALIEN_WIDTH)
+        thumby.display.drawSprite(self.player)
         self.draw_shield()
-        self.draw_charge_bar()
         self.draw_powerups()
+        self.draw_floating_texts()
+        
+        # Shake it as one, then draw the UI over it steady
+        if self.state.shake_frames > 0:
+            noise = self.noise
+            shake_x = noise.range(-SHAKE_INTENSITY, SHAKE_INTENSITY)
+            shake_y = noise.range(-SHAKE_INTENSITY, SHAKE_INTENSITY)
+            if shake_x or shake_y:
+                self.apply_shake(shake_x, shake_y)
+        self.draw_charge_bar()
         self.draw_powerup_indicator()
         self.draw_combo_indicator()
         self.draw_wave_announcement()
-        self.draw_floating_texts()
+        profiler.mark()
         self.draw_hud()
+        profiler.lap(PROF_HUD)
         self.draw_heat_gauge()
         
         if self.state.flash_frames > 0:
+            profiler.mark()
             self.draw_flash_effect()
+            profiler.lap(PROF_FLASH)
         
+        if profiler.enabled:
+            self.draw_profile()
+        
+        profiler.mark()
         thumby.display.update()
-
-    def run(self):
-        while True:
-            action = self.show_menu()
-            
-            if action == "START":
-                self.state.reset()
-                self.setup_game()
-                self.game_loop()
-                self.show_game_over()
-            elif action == "UPGRADE":
-                self.show_upgrade_menu()
-            elif action == "SCORES":
-                self.show_scores()
+        profiler.lap(PROF_DISPLAY)
 
 # Start the game with error handling
 if __name__ == "__main__":
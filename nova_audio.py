@@ -0,0 +1,112 @@
+"""Sound effects and music for NovaNaut's game loop.
+
+Game code asks for sounds with AudioMixer.play(sound) rather than
+calling thumby.audio directly. Requests made during a frame are
+coalesced: only the highest-priority one is kept, and update() sends it
+to the hardware once, at the end of the frame. A sound also can't cut
+off a higher-priority one that is still playing, so a burst of
+machine-gun shots won't drown out the player being hit.
+
+update() also steps the music sequencer one frame. A song is bytes of
+(note, frames) pairs: note indexes NOTE_FREQ, 0 is a rest. Notes
+are skipped, not delayed, while a sound effect is playing, so the song
+keeps time. Everything is table lookups and integer counters, and
+thumby.audio.play doesn't block, so update() neither waits nor
+allocates.
+"""
+from array import array
+from nova_platform import thumby, const
+
+AUDIO_FPS = const(60)  # NovaNaut.FPS: update() is called this often
+NOTE_GAP_MS = const(10)  # Silence cut from the end of each note so repeats are heard
+
+# Sound ids index the SOUND_* tables
+SND_SHOT = const(0)
+SND_CHARGED_SHOT = const(1)
+SND_KILL = const(2)
+SND_POWERUP = const(3)
+SND_OVERHEAT = const(4)
+SND_HIT = const(5)
+SOUND_FREQ = array('H', (800, 1000, 200, 1200, 100, 100))
+SOUND_MS = array('H', (50, 50, 100, 50, 100, 200))
+SOUND_PRIORITY = bytes((1, 1, 2, 3, 3, 4))  # Music plays at 0
+SOUND_FRAMES = bytes((ms * AUDIO_FPS + 999) // 1000 for ms in SOUND_MS)
+
+# Equal-tempered notes from A3 (1) to A5 (25); 0 is a rest
+NOTE_FREQ = array('H', (0, 220, 233, 247, 262, 277, 294, 311, 330, 349, 370, 392, 415,
+                        440, 466, 494, 523, 554, 587, 622, 659, 698, 740, 784, 831, 880))
+
+# Looping in-game theme in A minor: Am, F, G, E arpeggios in eighth notes
+THEME = bytes((
+    13, 8, 16, 8, 20, 8, 25, 8, 20, 8, 16, 8, 13, 8, 8, 8,
+    9, 8, 13, 8, 16, 8, 21, 8, 16, 8, 13, 8, 9, 8, 4, 8,
+    11, 8, 15, 8, 18, 8, 23, 8, 18, 8, 15, 8, 11, 8, 6, 8,
+    8, 8, 12, 8, 15, 8, 20, 16, 15, 8, 12, 8, 0, 8,
+))
+
+class AudioMixer:
+    __slots__ = ('pending', 'playing_priority', 'playing_frames', 'song', 'song_pos',
+                 'note_frames', 'played', 'dropped')
+
+    def __init__(self):
+        self.song = None
+        self.reset()
+
+    def reset(self):
+        self.pending = -1
+        self.playing_priority = 0
+        self.playing_frames = 0
+        self.song_pos = 0
+        self.note_frames = 0
+        self.played = 0
+        self.dropped = 0
+
+    def play(self, sound):
+        """Queue a sound for this frame. The highest priority queued wins; ties go to the first."""
+        pending = self.pending
+        if pending < 0 or SOUND_PRIORITY[sound] > SOUND_PRIORITY[pending]:
+            if pending >= 0:
+                self.dropped += 1
+            self.pending = sound
+        else:
+            self.dropped += 1
+
+    def start_music(self, song):
+        self.song = song
+        self.song_pos = 0
+        self.note_frames = 0
+
+    def stop(self):
+        self.song = None
+        self.pending = -1
+        self.playing_frames = 0
+        thumby.audio.stop()
+
+    def update(self):
+        """End the frame: start the winning sound effect, then step the music."""
+        if self.playing_frames > 0:
+            self.playing_frames -= 1
+        sound = self.pending
+        if sound >= 0:
+            self.pending = -1
+            priority = SOUND_PRIORITY[sound]
+            if self.playing_frames <= 0 or priority >= self.playing_priority:
+                thumby.audio.play(SOUND_FREQ[sound], SOUND_MS[sound])
+                self.playing_priority = priority
+                self.playing_frames = SOUND_FRAMES[sound]
+                self.played += 1
+            else:
+                self.dropped += 1
+
+        song = self.song
+        if song is not None:
+            self.note_frames -= 1
+            if self.note_frames <= 0:
+                pos = self.song_pos
+                note = song[pos]
+                frames = song[pos + 1]
+                pos += 2
+                self.song_pos = pos if pos < len(song) else 0
+                self.note_frames = frames
+                if note and self.playing_frames <= 0:
+                    thumby.audio.play(NOTE_FREQ[note], frames * 1000 // AUDIO_FPS - NOTE_GAP_MS)
@@ -0,0 +1,81 @@
+"""Pixel-accurate collision masks for NovaNaut.
+
+A Mask holds one integer per pixel row of a shape, with bit x set when
+column x is lit. The masks are built once at load time from the sprite
+bitmaps and trimmed to their lit pixels, so empty rows and columns
+never count as a hit. hit() rejects on the trimmed bounding boxes
+first, then ANDs the overlapping rows. Rows are lined up by shifting the
+mask that starts further left to the right, so the integers never grow
+and nothing is allocated.
+"""
+from array import array
+
+class Mask:
+    __slots__ = ('rows', 'x', 'y', 'width', 'height')
+
+    def __init__(self, rows, x, y, width):
+        self.rows = rows
+        self.x = x  # Offset of the lit bounding box inside the sprite
+        self.y = y
+        self.width = width
+        self.height = len(rows)
+
+def trimmed(rows):
+    """Mask of the lit part of full-size rows, with x and y offsets."""
+    top = 0
+    while top < len(rows) and not rows[top]:
+        top += 1
+    bottom = len(rows)
+    while bottom > top and not rows[bottom - 1]:
+        bottom -= 1
+    lit = 0
+    for y in range(top, bottom):
+        lit |= rows[y]
+    left = 0
+    while lit and not (lit >> left) & 1:
+        left += 1
+    width = 0
+    while lit >> (left + width):
+        width += 1
+    return Mask(array('H', [rows[y] >> left for y in range(top, bottom)]), left, top, width)
+
+def sprite_mask(bitmap, width, height):
+    """Mask of a Thumby sprite bitmap: columns of bytes, one band of 8 rows per page."""
+    rows = [0] * height
+    for y in range(height):
+        page = (y >> 3) * width
+        bit = 1 << (y & 7)
+        for x in range(width):
+            if bitmap[page + x] & bit:
+                rows[y] |= 1 << x
+    return trimmed(rows)
+
+def box_mask(width, height):
+    return trimmed([(1 << width) - 1] * height)
+
+def hit(a, ax, ay, b, bx, by):
+    """True if mask a drawn at (ax, ay) shares a lit pixel with mask b at (bx, by)."""
+    ax += a.x
+    ay += a.y
+    bx += b.x
+    by += b.y
+    if (bx >= ax + a.width or ax >= bx + b.width or
+        by >= ay + a.height or ay >= by + b.height):
+        return False
+    top = ay if ay > by else by
+    bottom = ay + a.height
+    if by + b.height < bottom:
+        bottom = by + b.height
+    ra = a.rows
+    rb = b.rows
+    if bx >= ax:
+        shift = bx - ax
+        for y in range(top, bottom):
+            if (ra[y - ay] >> shift) & rb[y - by]:
+                return True
+    else:
+        shift = ax - bx
+        for y in range(top, bottom):
+            if ra[y - ay] & (rb[y - by] >> shift):
+                return True
+    return False
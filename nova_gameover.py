@@ -0,0 +1,34 @@
+"""NovaNaut's game over screen, loaded by NovaNaut.show_screen only while it is shown."""
+from nova_platform import thumby, const
+
+SCREEN_WIDTH = const(72)  # NovaNaut.SCREEN_WIDTH
+SCREEN_HEIGHT = const(40)  # NovaNaut.SCREEN_HEIGHT
+
+def show(game):
+    """Record and save the score, then show it until B."""
+    state = game.state
+    state.record_score()
+    game.save.capture(state)
+    game.save.flush()
+
+    while True:
+        thumby.display.fill(0)
+
+        text = "GAME OVER"
+        x = (SCREEN_WIDTH - len(text) * 6) // 2
+        thumby.display.drawText(text, x, 8, 1)
+
+        score_text = f"SCORE: {state.score}"
+        x = (SCREEN_WIDTH - len(score_text) * 6) // 2
+        thumby.display.drawText(score_text, x, 20, 1)
+
+        hi_text = f"HIGH: {state.high_score}"
+        x = (SCREEN_WIDTH - len(hi_text) * 6) // 2
+        thumby.display.drawText(hi_text, x, 28, 1)
+
+        thumby.display.drawText("B:MENU", 2, SCREEN_HEIGHT - 8, 1)
+
+        thumby.display.update()
+
+        if thumby.buttonB.justPressed():
+            return
@@ -0,0 +1,90 @@
+"""Garbage-collection policy for NovaNaut's game loop.
+
+Automatic collection is switched off while a game runs so it can't land
+mid-wave. GcPolicy collects instead when a frame finishes with enough
+spare time for a collection, when free memory drops below a reserve, or
+at a natural pause like a wave announcement. MicroPython's collector
+isn't incremental, so the "chunks" are whole collections spread over
+idle frames rather than one big pause.
+
+It also measures how much each frame allocates. With strict set, a frame
+over budget raises AssertionError. mem_alloc() walks the heap, so it
+is read once per frame, and free memory is worked out from the heap size
+taken at start().
+"""
+import gc
+from nova_platform import const, ticks_us, ticks_diff, mem_alloc, mem_free
+
+ALLOC_BUDGET = const(256)     # Bytes a frame may allocate before it counts as over budget
+GC_RESERVE = const(8192)      # Collect at once when free memory drops below this
+GC_MIN_GARBAGE = const(2048)  # Idle collects wait until this much has been allocated
+GC_COLLECT_US = const(3000)   # Starting guess at a collection's duration
+
+class GcPolicy:
+    __slots__ = ('budget', 'strict', 'reserve', 'min_garbage', 'collect_us', 'heap_size',
+                 'frame_start', 'last_collect', 'frame_alloc', 'worst_alloc', 'frames',
+                 'over_budget', 'collections', 'forced_collections')
+
+    def __init__(self, budget=ALLOC_BUDGET, strict=False, reserve=GC_RESERVE,
+                 min_garbage=GC_MIN_GARBAGE):
+        self.budget = budget
+        self.strict = strict
+        self.reserve = reserve
+        self.min_garbage = min_garbage
+        self.collect_us = GC_COLLECT_US
+        self.heap_size = 0
+        self.frame_start = 0
+        self.last_collect = 0
+        self.reset()
+
+    def reset(self):
+        self.frame_alloc = 0
+        self.worst_alloc = 0
+        self.frames = 0
+        self.over_budget = 0
+        self.collections = 0
+        self.forced_collections = 0
+
+    def start(self):
+        """Collect once and switch automatic collection off."""
+        self.reset()
+        gc.collect()
+        gc.disable()
+        alloc = mem_alloc()
+        self.heap_size = alloc + mem_free()
+        self.frame_start = alloc
+        self.last_collect = alloc
+
+    def stop(self):
+        gc.enable()
+
+    def collect(self):
+        t0 = ticks_us()
+        gc.collect()
+        us = ticks_diff(ticks_us(), t0)
+        # Follow slower collections at once, faster ones gradually
+        self.collect_us = max(us, (self.collect_us * 7) >> 3)
+        self.collections += 1
+        self.last_collect = mem_alloc()
+        self.frame_start = self.last_collect
+
+    def end_frame(self, spare_us):
+        """Account for the frame just drawn, then collect if there is time or need."""
+        alloc = mem_alloc()
+        used = alloc - self.frame_start
+        self.frame_start = alloc
+        self.frames += 1
+        # A negative delta means the VM ran out of heap and collected on its own
+        if used >= 0:
+            self.frame_alloc = used
+            if used > self.worst_alloc:
+                self.worst_alloc = used
+            if used > self.budget:
+                self.over_budget += 1
+                if self.strict:
+                    raise AssertionError('frame allocated %d bytes, budget %d' % (used, self.budget))
+        if self.heap_size - alloc < self.reserve:
+            self.forced_collections += 1
+            self.collect()
+        elif spare_us >= self.collect_us and alloc - self.last_collect >= self.min_garbage:
+            self.collect()
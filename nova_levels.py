@@ -0,0 +1,100 @@
+"""Level scripts and spawn schedules for NovaNaut.
+
+LEVELS describes one wave per level. At the start of a wave, the level
+is compiled into a SpawnSchedule: parallel arrays of (frame, alien type,
+y), sorted by frame. update_aliens then only checks whether the next
+entry is due. Compiling uses its own nova_rng.Rng seeded from
+(seed, wave), so the same seed always gives the same waves and leaves
+the game's streams alone.
+
+Each level is (enemies, max_aliens, gap_min, gap_max, weights, bosses):
+  enemies      regular aliens in the wave
+  max_aliens   most aliens on screen at once
+  gap_min/max  frames between spawns, picked uniformly
+  weights      relative odds of (basic, scout, elite)
+  bosses       boss aliens that arrive after the last regular one
+Waves past the end of LEVELS replay the last level with WAVE_ENEMY_STEP
+more enemies per extra wave.
+"""
+from array import array
+from nova_platform import const
+from nova_rng import Rng
+
+SCHEDULE_CAPACITY = const(64)
+BOSS_TYPE = const(3)  # NovaNaut.ALIEN_BOSS
+BOSS_DELAY = const(120)  # Frames between the last regular alien and a boss
+SPAWN_HEIGHT = const(32)  # Aliens spawn with y in 0..SPAWN_HEIGHT
+WAVE_ENEMY_STEP = const(5)  # Extra enemies per wave past the end of LEVELS
+
+LEVELS = (
+    (5, 6, 30, 70, (8, 1, 1), 0),
+    (10, 7, 30, 70, (7, 2, 1), 0),
+    (15, 8, 25, 60, (6, 2, 2), 0),
+    (18, 8, 25, 55, (5, 3, 2), 1),
+    (22, 8, 20, 50, (4, 3, 3), 0),
+    (26, 8, 20, 45, (4, 3, 3), 0),
+    (30, 8, 15, 40, (3, 3, 4), 0),
+    (34, 8, 15, 35, (2, 3, 5), 1),
+)
+
+def level_for_wave(wave_number):
+    """1-based index into LEVELS for a wave number."""
+    return min(max(wave_number, 1), len(LEVELS))
+
+class SpawnSchedule:
+    __slots__ = ('frames', 'types', 'ys', 'count', 'next', 'clock', 'max_aliens', 'rng')
+
+    def __init__(self, capacity=SCHEDULE_CAPACITY):
+        self.frames = array('H', [0] * capacity)
+        self.types = array('B', [0] * capacity)
+        self.ys = array('B', [0] * capacity)
+        self.count = 0
+        self.next = 0
+        self.clock = 0
+        self.max_aliens = 0
+        self.rng = Rng()
+
+    def compile(self, wave_number, seed=0):
+        level = LEVELS[level_for_wave(wave_number) - 1]
+        enemies, max_aliens, gap_min, gap_max, weights, bosses = level
+        enemies += WAVE_ENEMY_STEP * max(0, wave_number - len(LEVELS))
+        capacity = len(self.frames)
+        if enemies + bosses > capacity:
+            enemies = capacity - bosses
+        rng = self.rng
+        # Mix (seed, wave) in 16 bits, every product under 2^30 so it stays a
+        # small int on the device. The odd multiplier keeps seeds distinct.
+        mix = (seed ^ (seed >> 16)) & 0xffff
+        rng.seed(((mix * 0x3B5) ^ (wave_number * 0x2C1B)) & 0xffff)
+        total = weights[0] + weights[1] + weights[2]
+
+        frame = 0
+        for i in range(enemies):
+            roll = rng.below(total)
+            alien_type = 0
+            while roll >= weights[alien_type]:
+                roll -= weights[alien_type]
+                alien_type += 1
+            self.frames[i] = frame
+            self.types[i] = alien_type
+            self.ys[i] = rng.below(SPAWN_HEIGHT + 1)
+            frame += gap_min + rng.below(gap_max - gap_min + 1)
+        for i in range(enemies, enemies + bosses):
+            frame += BOSS_DELAY
+            self.frames[i] = frame
+            self.types[i] = BOSS_TYPE
+            self.ys[i] = SPAWN_HEIGHT // 2
+        self.count = enemies + bosses
+        self.next = 0
+        self.clock = 0
+        self.max_aliens = max_aliens
+
+    def clear(self):
+        self.count = 0
+        self.next = 0
+        self.clock = 0
+
+    def due(self):
+        """True if the next entry's frame has come. Advances the schedule clock."""
+        self.clock += 1
+        return self.next < self.count and self.frames[self.next] < self.clock
@@ -0,0 +1,52 @@
+"""NovaNaut's title menu, loaded by NovaNaut.show_screen only while it is shown."""
+from nova_platform import thumby, const
+
+SCREEN_WIDTH = const(72)  # NovaNaut.SCREEN_WIDTH
+MENU_ITEMS = ("START", "UPGRADE", "SCORES")
+
+def show(game):
+    """Run the menu until an item is picked. Returns the item's name."""
+    selected = 0
+
+    while True:
+        thumby.display.fill(0)
+
+        title = "NOVANAUT"
+        title_x = (SCREEN_WIDTH - len(title) * 6) // 2
+        game.title_flash_timer = (game.title_flash_timer + 1) % 30
+        if game.title_flash_timer < 20:
+            thumby.display.drawText(title, title_x, 4, 1)
+
+        for i, item in enumerate(MENU_ITEMS):
+            y = 15 + i * 8
+            x = (SCREEN_WIDTH - len(item) * 6) // 2
+            if i == selected:
+                thumby.display.drawRectangle(x - 2, y - 1, len(item) * 6 + 3, 9, 1)
+            thumby.display.drawText(item, x, y, 1 if i != selected else 0)
+        if game.profiler.enabled:
+            marker = "PA" if game.profiler.track_alloc else "P"
+            thumby.display.drawText(marker, SCREEN_WIDTH - len(marker) * 6, 0, 1)
+
+        thumby.display.update()
+
+        if thumby.buttonU.justPressed() and selected > 0:
+            selected -= 1
+            thumby.audio.play(800, 50)
+        elif thumby.buttonD.justPressed() and selected < len(MENU_ITEMS) - 1:
+            selected += 1
+            thumby.audio.play(800, 50)
+        elif thumby.buttonA.justPressed():
+            thumby.audio.play(1000, 100)
+            return MENU_ITEMS[selected]
+        elif thumby.buttonB.justPressed():
+            # Cycle the profiler off -> timing -> timing and allocations.
+            # It is dumped to PROFILE_PATH at game over.
+            profiler = game.profiler
+            if not profiler.enabled:
+                profiler.enabled = True
+            elif not profiler.track_alloc:
+                profiler.track_alloc = True
+            else:
+                profiler.enabled = False
+                profiler.track_alloc = False
+            thumby.audio.play(600, 50)
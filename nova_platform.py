@@ -0,0 +1,29 @@
+"""Platform backend for NovaNaut.
+
+Game code reaches the hardware only through the names this module exports:
+  thumby      display (the 72x40 framebuffer and drawing), buttonU/D/L/R/A/B
+              (pressed, justPressed), audio (play, stop) and Sprite
+  const       micropython.const
+  ticks_ms, ticks_us, ticks_diff, sleep_us    the clock
+  mem_alloc, mem_free                         heap figures from gc
+On a Thumby these are the real modules. Anywhere else, importing this
+module loads the pure-Python backend in tools/headless.py instead: a
+bytearray framebuffer in the display's page layout, scripted buttons,
+silent audio that counts its calls, a virtual clock that only moves when
+slept or advanced, and a const that returns its argument. The game logic
+runs on it unchanged.
+"""
+try:
+    import thumby
+    from micropython import const
+    from time import ticks_ms, ticks_us, ticks_diff, sleep_us
+    from gc import mem_alloc, mem_free
+    HEADLESS = False
+except ImportError:
+    import os
+    import sys
+    tools = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools')
+    if tools not in sys.path:
+        sys.path.append(tools)
+    from headless import thumby, const, ticks_ms, ticks_us, ticks_diff, sleep_us, mem_alloc, mem_free
+    HEADLESS = True
@@ -0,0 +1,127 @@
+"""Frame-stage profiler for NovaNaut.
+
+The game calls mark() before and lap(stage) after each timed stage. Lap
+times are measured with ticks_us and summed over the frame.
+end_frame() moves them, plus the whole-frame time, into a ring buffer of
+the last PROFILE_FRAMES frames. While profiling nothing allocates, so it
+can stay on during play on the device. When disabled each call returns
+straight away.
+
+With track_alloc set, lap() also charges each stage the bytes it
+allocated, read from mem_alloc(). That call walks the heap. It is
+made outside the ticks_us readings, so stage times stay honest, but the
+frame total grows by the cost of those walks.
+"""
+from array import array
+from nova_platform import const, ticks_us, ticks_diff, mem_alloc
+
+PROFILE_FRAMES = const(120)
+
+class Profiler:
+    __slots__ = ('names', 'stages', 'enabled', 'track_alloc', 'totals', 'history', 'frames',
+                 'head', 'count', 'frame_start', 'last', 'worst_us',
+                 'alloc_totals', 'alloc_history', 'frame_alloc_start', 'last_alloc')
+
+    def __init__(self, names, frames=PROFILE_FRAMES):
+        self.names = names
+        self.stages = len(names)
+        self.enabled = False
+        self.track_alloc = False
+        self.totals = array('l', [0] * self.stages)
+        self.alloc_totals = array('l', [0] * self.stages)
+        # One row per frame: each stage's microseconds, then the frame total;
+        # alloc_history has the same layout in bytes, capped at 65535
+        self.history = array('l', [0] * (frames * (self.stages + 1)))
+        self.alloc_history = array('H', [0] * (frames * (self.stages + 1)))
+        self.frames = frames
+        self.reset()
+
+    def reset(self):
+        for i in range(self.stages):
+            self.totals[i] = 0
+            self.alloc_totals[i] = 0
+        self.head = 0
+        self.count = 0
+        self.frame_start = ticks_us()
+        self.last = self.frame_start
+        self.worst_us = 0
+        self.frame_alloc_start = 0
+        self.last_alloc = 0
+
+    def begin_frame(self):
+        if self.enabled:
+            if self.track_alloc:
+                self.frame_alloc_start = mem_alloc()
+            self.frame_start = ticks_us()
+            self.last = self.frame_start
+
+    def mark(self):
+        """Restart the stage clock so untimed work isn't charged to the next stage."""
+        if self.enabled:
+            if self.track_alloc:
+                self.last_alloc = mem_alloc()
+            self.last = ticks_us()
+
+    def lap(self, stage):
+        if self.enabled:
+            now = ticks_us()
+            self.totals[stage] += ticks_diff(now, self.last)
+            if self.track_alloc:
+                alloc = mem_alloc()
+                self.alloc_totals[stage] += alloc - self.last_alloc
+                self.last_alloc = alloc
+            self.last = ticks_us()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        frame_us = ticks_diff(ticks_us(), self.frame_start)
+        stages = self.stages
+        row = self.head * (stages + 1)
+        for i in range(stages):
+            self.history[row + i] = self.totals[i]
+            self.totals[i] = 0
+        self.history[row + stages] = frame_us
+        if self.track_alloc:
+            for i in range(stages):
+                self.alloc_history[row + i] = min(max(self.alloc_totals[i], 0), 0xffff)
+                self.alloc_totals[i] = 0
+            used = mem_alloc() - self.frame_alloc_start
+            self.alloc_history[row + stages] = min(max(used, 0), 0xffff)
+        if frame_us > self.worst_us:
+            self.worst_us = frame_us
+        self.head = (self.head + 1) % self.frames
+        if self.count < self.frames:
+            self.count += 1
+
+    def latest(self, stage, history=None):
+        """Microseconds for stage in the last finished frame; stage == stages is the frame total.
+
+        Pass alloc_history as history for bytes instead.
+        """
+        if not self.count:
+            return 0
+        if history is None:
+            history = self.history
+        return history[(self.head - 1) % self.frames * (self.stages + 1) + stage]
+
+    def dump(self, path):
+        """Write the buffered frames, oldest first, as CSV. Returns the row count."""
+        stages = self.stages
+        with open(path, 'w') as f:
+            f.write('frame,' + ','.join(self.names) + ',total')
+            if self.track_alloc:
+                for name in self.names:
+                    f.write(',' + name + '_bytes')
+                f.write(',total_bytes')
+            f.write('\n')
+            for n in range(self.count):
+                row = (self.head - self.count + n) % self.frames * (stages + 1)
+                f.write(str(n))
+                for i in range(stages + 1):
+                    f.write(',' + str(self.history[row + i]))
+                if self.track_alloc:
+                    for i in range(stages + 1):
+                        f.write(',' + str(self.alloc_history[row + i]))
+                f.write('\n')
+        return self.count
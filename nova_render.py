@@ -0,0 +1,99 @@
+"""Batched drawing straight into NovaNaut's framebuffer.
+
+The display buffer is in SSD1306 page layout: byte (y >> 3) * 72 + x
+holds column x of the page containing row y, with row y at bit y & 7.
+These functions write that buffer directly, using the row offsets and
+bit masks precomputed below, and each one draws a whole batch of
+objects. A frame then pays one call and one clip setup per kind of
+object instead of one display call, with its own clipping, per object.
+
+The output is pixel-identical to the display calls they replace:
+drawFilledRectangle for bullets, setPixel for particles and an opaque
+drawSprite for aliens. tools/bench_render.py checks this.
+"""
+from array import array
+from nova_platform import const
+
+SCREEN_WIDTH = const(72)  # NovaNaut.SCREEN_WIDTH
+SCREEN_HEIGHT = const(40)  # NovaNaut.SCREEN_HEIGHT
+PAGES = const(5)
+BULLET_WIDTH = const(3)
+BULLET_HEIGHT = const(2)
+
+# Per row: the offset of its page, its bit, and a two-row bar's bits in
+# its page and spilling into the next
+ROW_OFFSET = array('H', ((y >> 3) * SCREEN_WIDTH for y in range(SCREEN_HEIGHT)))
+ROW_BIT = bytes(1 << (y & 7) for y in range(SCREEN_HEIGHT))
+BAR_LOW = bytes((3 << (y & 7)) & 0xff for y in range(SCREEN_HEIGHT))
+BAR_HIGH = bytes((3 << (y & 7)) >> 8 for y in range(SCREEN_HEIGHT))
+# Per shift: the bits an opaque page shifted down by it leaves alone in
+# the page it starts in and in the page below
+KEEP_LOW = bytes((1 << s) - 1 for s in range(8))
+KEEP_HIGH = bytes((0xff << s) & 0xff for s in range(8))
+
+def plot_points(buf, xs, ys, count, shift):
+    """Set the pixel at each fixed-point (xs[i], ys[i]) >> shift on screen."""
+    x_limit = SCREEN_WIDTH << shift
+    y_limit = SCREEN_HEIGHT << shift
+    for i in range(count):
+        x = xs[i]
+        y = ys[i]
+        if 0 <= x < x_limit and 0 <= y < y_limit:
+            y >>= shift
+            buf[ROW_OFFSET[y] + (x >> shift)] |= ROW_BIT[y]
+
+def draw_bullets(buf, xs, ys, count, shift):
+    """Fill a 3x2 box at each fixed-point bullet position.
+
+    A bullet is drawn only if the whole box is on screen. That bound is
+    moved into fixed-point once, so each bullet costs two range checks.
+    """
+    x_limit = (SCREEN_WIDTH - BULLET_WIDTH) << shift
+    y_limit = (SCREEN_HEIGHT - BULLET_HEIGHT) << shift
+    for i in range(count):
+        x = xs[i]
+        y = ys[i]
+        if 0 <= x < x_limit and 0 <= y < y_limit:
+            y >>= shift
+            a = ROW_OFFSET[y] + (x >> shift)
+            bits = BAR_LOW[y]
+            buf[a] |= bits
+            buf[a + 1] |= bits
+            buf[a + 2] |= bits
+            bits = BAR_HIGH[y]
+            if bits:
+                a += SCREEN_WIDTH
+                buf[a] |= bits
+                buf[a + 1] |= bits
+                buf[a + 2] |= bits
+
+def blit_aliens(buf, aliens, bitmaps, widths):
+    """Draw each alien's one-page bitmap opaquely, in list order.
+
+    bitmaps and widths are indexed by alien type. Aliens are drawn in the
+    order given, not grouped by type, so overlaps cover each other just
+    as separate drawSprite calls would.
+    """
+    for alien in aliens:
+        kind = alien.type
+        width = widths[kind]
+        x = int(alien.x)
+        y = int(alien.y)
+        if x >= SCREEN_WIDTH or x + width <= 0 or y >= SCREEN_HEIGHT or y <= -8:
+            continue
+        bitmap = bitmaps[kind]
+        x0 = x if x > 0 else 0
+        x1 = x + width if x + width < SCREEN_WIDTH else SCREEN_WIDTH
+        shift = y & 7
+        page = y >> 3
+        if page >= 0:
+            keep = KEEP_LOW[shift]
+            a = page * SCREEN_WIDTH
+            for col in range(x0, x1):
+                buf[a + col] = (buf[a + col] & keep) | ((bitmap[col - x] << shift) & 0xff)
+        if shift and page + 1 < PAGES:
+            keep = KEEP_HIGH[shift]
+            down = 8 - shift
+            a = (page + 1) * SCREEN_WIDTH
+            for col in range(x0, x1):
+                buf[a + col] = (buf[a + col] & keep) | (bitmap[col - x] >> down)
@@ -0,0 +1,200 @@
+"""Input recording and replay for NovaNaut.
+
+The game reads its buttons once per simulation step as a one-byte mask
+(BTN_U..BTN_B). InputLog can record those masks, run-length encoded, into
+a buffer allocated before the game starts. A run starts with a byte
+holding the mask in its low six bits and a code in the top two: codes 0
+to 2 are runs of one to three steps, and code 3 means the next byte
+holds the step count, up to 255. Quick taps cost a byte, and a held
+button two bytes per 255 steps. With the seed and upgrade levels the
+game started with, that is everything the simulation depends on.
+Replaying the file gives the same game step for step, so a session from
+a device can be played back, drawn or not, for profiling and for
+checking that a change didn't alter play.
+
+A recording that fills the buffer stops there. Its file still plays back
+up to that point, and playback ends where the recording did.
+"""
+import struct
+from nova_platform import thumby, const
+from nova_save import UPGRADE_KEYS
+
+BTN_U = const(1)
+BTN_D = const(2)
+BTN_L = const(4)
+BTN_R = const(8)
+BTN_A = const(16)
+BTN_B = const(32)
+
+REPLAY_OFF = const(0)
+REPLAY_RECORD = const(1)
+REPLAY_PLAY = const(2)
+
+BUTTON_BITS = const(0x3f)
+RUN_STEP = const(0x40)  # One more step on a run of one or two
+RUN_COUNTED = const(0xc0)  # A count byte follows
+
+REPLAY_BYTES = const(8192)  # Recording buffer, a few minutes of busy play
+REPLAY_MAGIC = const(0x4E52)
+# magic, seed, steps, one level per UPGRADE_KEYS
+HEADER_FORMAT = '<HII3B'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+def read_buttons():
+    """The buttons held right now as a BTN_* mask."""
+    mask = 0
+    if thumby.buttonU.pressed():
+        mask |= BTN_U
+    if thumby.buttonD.pressed():
+        mask |= BTN_D
+    if thumby.buttonL.pressed():
+        mask |= BTN_L
+    if thumby.buttonR.pressed():
+        mask |= BTN_R
+    if thumby.buttonA.pressed():
+        mask |= BTN_A
+    if thumby.buttonB.pressed():
+        mask |= BTN_B
+    return mask
+
+class InputLog:
+    __slots__ = ('capacity', 'buffer', 'length', 'last', 'mode', 'seed', 'steps', 'upgrades',
+                 'full', 'pos', 'left', 'mask', 'ended')
+
+    def __init__(self, capacity=REPLAY_BYTES):
+        self.capacity = capacity
+        self.buffer = None  # Allocated by the first recording or load
+        self.length = 0
+        self.last = 0  # Where the run being recorded starts
+        self.mode = REPLAY_OFF
+        self.seed = 0
+        self.steps = 0
+        self.upgrades = bytearray(len(UPGRADE_KEYS))
+        self.full = False
+        self.pos = 0
+        self.left = 0
+        self.mask = 0
+        self.ended = False
+
+    def read(self):
+        """This step's buttons: the pad's, recorded if recording, or the replay's."""
+        mode = self.mode
+        if mode == REPLAY_PLAY:
+            return self.next()
+        mask = read_buttons()
+        if mode == REPLAY_RECORD:
+            self.record(mask)
+        return mask
+
+    def start_recording(self, seed, upgrades):
+        """Record from the next read() on, for a game started with seed and upgrades."""
+        if self.buffer is None:
+            self.buffer = bytearray(self.capacity)
+        self.length = 0
+        self.seed = seed
+        self.steps = 0
+        for i in range(len(UPGRADE_KEYS)):
+            self.upgrades[i] = upgrades[UPGRADE_KEYS[i]]
+        self.full = False
+        self.mode = REPLAY_RECORD
+
+    def record(self, mask):
+        buffer = self.buffer
+        n = self.length
+        if n:
+            last = self.last
+            run = buffer[last]
+            if run & BUTTON_BITS == mask:
+                code = run >> 6
+                if code < 2:
+                    buffer[last] = run + RUN_STEP
+                    self.steps += 1
+                    return
+                if code == 3 and buffer[last + 1] < 255:
+                    buffer[last + 1] += 1
+                    self.steps += 1
+                    return
+                if code == 2 and n < len(buffer):  # Three steps become a counted four
+                    buffer[last] = run | RUN_COUNTED
+                    buffer[n] = 4
+                    self.length = n + 1
+                    self.steps += 1
+                    return
+        if n < len(buffer):
+            buffer[n] = mask
+            self.last = n
+            self.length = n + 1
+            self.steps += 1
+        else:
+            self.full = True
+            self.mode = REPLAY_OFF
+
+    def stop(self):
+        self.mode = REPLAY_OFF
+        self.ended = False
+
+    def save(self, path):
+        """Write the recording. Returns its size in bytes."""
+        header = struct.pack(HEADER_FORMAT, REPLAY_MAGIC, self.seed, self.steps, *self.upgrades)
+        with open(path, 'wb') as f:
+            f.write(header)
+            f.write(memoryview(self.buffer)[0:self.length])
+        return HEADER_SIZE + self.length
+
+    def load(self, path):
+        """Read a recording and get ready to play it. Returns False if it isn't one."""
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return False
+        size = len(data) - HEADER_SIZE
+        if size < 0:
+            return False
+        magic, seed, steps, *upgrades = struct.unpack_from(HEADER_FORMAT, data)
+        if magic != REPLAY_MAGIC:
+            return False
+        if self.buffer is None or len(self.buffer) < size:
+            self.buffer = bytearray(max(size, self.capacity))
+        self.buffer[0:size] = data[HEADER_SIZE:]
+        self.length = size
+        self.seed = seed
+        self.steps = steps
+        for i in range(len(UPGRADE_KEYS)):
+            self.upgrades[i] = upgrades[i]
+        self.full = False
+        self.rewind()
+        return True
+
+    def apply(self, state):
+        """Give state the upgrade levels the recorded game started with."""
+        for i in range(len(UPGRADE_KEYS)):
+            state.upgrades[UPGRADE_KEYS[i]] = self.upgrades[i]
+
+    def rewind(self):
+        """Play the loaded recording from its first step on the next read()."""
+        self.pos = 0
+        self.left = 0
+        self.ended = not self.length
+        self.mode = REPLAY_PLAY
+
+    def next(self):
+        """The next recorded mask. ended is set as the last one is handed out."""
+        if not self.left:
+            pos = self.pos
+            if pos >= self.length:
+                self.ended = True
+                return 0
+            buffer = self.buffer
+            run = buffer[pos]
+            self.mask = run & BUTTON_BITS
+            if run >= RUN_COUNTED:
+                self.left = buffer[pos + 1]
+                self.pos = pos + 2
+            else:
+                self.left = (run >> 6) + 1
+                self.pos = pos + 1
+        self.left -= 1
+        if not self.left and self.pos >= self.length:
+            self.ended = True
+        return self.mask
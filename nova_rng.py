@@ -0,0 +1,105 @@
+"""Seedable random numbers for NovaNaut.
+
+Rng is a 16-bit xorshift generator (shifts 7, 9, 8; period 65535). Its
+state fits a MicroPython small int, and the range helpers are
+integer-only: below(n) scales by a multiply and a shift instead of a
+division. A small int holds 30 bits on the device, so that product
+stays one only for n up to 16384; within that a draw allocates nothing.
+The game never asks for more than a few hundred.
+
+The game keeps separate streams. NovaNaut.rng decides anything that
+changes the game (power-up drops and, through the level seed, spawns).
+NovaNaut.fx lays out the stars and the flash masks and fills
+NovaNaut.noise, a RandomTable that serves the per-frame effects
+(particles, shake, the flash mirroring) with one table step per draw.
+Effects then never move the gameplay stream, so a seed replays the same
+game whether or not it is drawn.
+"""
+from nova_platform import const
+
+NOISE_SIZE = const(256)  # RandomTable entries; a power of two
+NOISE_MASK = const(NOISE_SIZE - 1)
+
+class Rng:
+    __slots__ = ('state',)
+
+    def __init__(self, seed=1):
+        self.seed(seed)
+
+    def seed(self, value):
+        """Start the stream over. Bits above 16 are folded in; 0 maps to 1."""
+        value ^= value >> 16
+        self.state = (value & 0xffff) or 1
+
+    def next(self):
+        """Next 16-bit value, never 0."""
+        x = self.state
+        x ^= (x << 7) & 0xffff
+        x ^= x >> 9
+        x ^= (x << 8) & 0xffff
+        self.state = x
+        return x
+
+    def below(self, n):
+        """0..n-1. Allocation-free for n up to 16384; larger n allocates on the device."""
+        x = self.state
+        x ^= (x << 7) & 0xffff
+        x ^= x >> 9
+        x ^= (x << 8) & 0xffff
+        self.state = x
+        return (x * n) >> 16
+
+    def bits(self, n):
+        """The top n bits of the next value, n up to 16."""
+        x = self.state
+        x ^= (x << 7) & 0xffff
+        x ^= x >> 9
+        x ^= (x << 8) & 0xffff
+        self.state = x
+        return x >> (16 - n)
+
+    def range(self, low, high):
+        """low..high inclusive, like random.randint; the span has below()'s limit."""
+        return low + self.below(high - low + 1)
+
+    def choice(self, seq):
+        return seq[self.below(len(seq))]
+
+class RandomTable:
+    """NOISE_SIZE random bytes, handed out in turn and wrapping around.
+
+    For effects drawn every frame: a draw is an index step and a lookup.
+    The sequence repeats every NOISE_SIZE draws, which is fine for pixels
+    but not for anything that needs many independent values at once.
+    """
+    __slots__ = ('table', 'pos')
+
+    def __init__(self):
+        self.table = bytearray(NOISE_SIZE)
+        self.pos = 0
+
+    def fill(self, rng):
+        """Refill the table in place from rng and start from the top."""
+        table = self.table
+        for i in range(NOISE_SIZE):
+            table[i] = rng.next() >> 8
+        self.pos = 0
+
+    def next(self):
+        """Next byte, 0..255."""
+        pos = self.pos
+        self.pos = (pos + 1) & NOISE_MASK
+        return self.table[pos]
+
+    def below(self, n):
+        """0..n-1, for n up to 256."""
+        pos = self.pos
+        self.pos = (pos + 1) & NOISE_MASK
+        return (self.table[pos] * n) >> 8
+
+    def bits(self, n):
+        """The top n bits of the next byte, n up to 8."""
+        return self.next() >> (8 - n)
+
+    def range(self, low, high):
+        return low + self.below(high - low + 1)
@@ -0,0 +1,124 @@
+"""Saved progress for NovaNaut: the top scores, credits and upgrades.
+
+Progress is one fixed-size struct record with a Fletcher-16 checksum.
+Each save appends a record to a small log file rather than rewriting it,
+which keeps flash wear down. Once the log holds LOG_RECORDS records it is
+compacted to just the latest one, via a temporary file and a rename.
+Loading is a single readinto of the whole log into a preallocated buffer,
+scanned from the end for the newest record that checks out, so a save
+cut short by a power cut falls back to the one before it.
+
+The game only calls flush() from the menus and the game over screen,
+never while a wave is running.
+"""
+import os
+import struct
+from nova_platform import const
+
+TOP_SCORES = const(3)
+LOG_RECORDS = const(32)  # Records the log holds before it is compacted
+SAVE_MAGIC = const(0x4E53)
+UPGRADE_KEYS = ('speed', 'power', 'shield')
+
+# magic, credits, one level per UPGRADE_KEYS, TOP_SCORES scores, checksum
+RECORD_FORMAT = '<HI3B3IH'
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+BODY_SIZE = RECORD_SIZE - 2
+
+def checksum(buf, offset):
+    """Fletcher-16 of the BODY_SIZE bytes at offset."""
+    a = 0
+    b = 0
+    for i in range(offset, offset + BODY_SIZE):
+        a = (a + buf[i]) % 255
+        b = (b + a) % 255
+    return (b << 8) | a
+
+class SaveStore:
+    __slots__ = ('path', 'log_records', 'buffer', 'record', 'records',
+                 'credits', 'upgrades', 'scores', 'dirty')
+
+    def __init__(self, path, log_records=LOG_RECORDS):
+        self.path = path
+        self.log_records = log_records
+        self.buffer = bytearray(RECORD_SIZE * log_records)
+        self.record = bytearray(RECORD_SIZE)
+        self.records = 0
+        self.credits = 0
+        self.upgrades = bytearray(len(UPGRADE_KEYS))
+        self.scores = [0] * TOP_SCORES
+        self.dirty = False
+
+    def load(self):
+        """Read the newest valid record. Returns False if there was none."""
+        try:
+            with open(self.path, 'rb') as f:
+                n = f.readinto(self.buffer) or 0
+        except OSError:
+            n = 0
+        self.records = n // RECORD_SIZE
+        if n % RECORD_SIZE:
+            # A torn append would misalign the next one, so compact on save
+            self.records = self.log_records
+        buf = self.buffer
+        for i in range(n // RECORD_SIZE - 1, -1, -1):
+            offset = i * RECORD_SIZE
+            fields = struct.unpack_from(RECORD_FORMAT, buf, offset)
+            if fields[0] == SAVE_MAGIC and fields[-1] == checksum(buf, offset):
+                self.credits = fields[1]
+                for k in range(len(UPGRADE_KEYS)):
+                    self.upgrades[k] = fields[2 + k]
+                for k in range(TOP_SCORES):
+                    self.scores[k] = fields[2 + len(UPGRADE_KEYS) + k]
+                return True
+        return False
+
+    def apply(self, state):
+        state.credits = self.credits
+        for k in range(len(UPGRADE_KEYS)):
+            state.upgrades[UPGRADE_KEYS[k]] = self.upgrades[k]
+        for k in range(TOP_SCORES):
+            state.high_scores[k] = self.scores[k]
+        state.high_score = self.scores[0]
+
+    def capture(self, state):
+        """Take the state's progress, marking the store dirty if anything changed."""
+        if state.credits != self.credits:
+            self.credits = state.credits
+            self.dirty = True
+        for k in range(len(UPGRADE_KEYS)):
+            level = state.upgrades[UPGRADE_KEYS[k]]
+            if level != self.upgrades[k]:
+                self.upgrades[k] = level
+                self.dirty = True
+        for k in range(TOP_SCORES):
+            if state.high_scores[k] != self.scores[k]:
+                self.scores[k] = state.high_scores[k]
+                self.dirty = True
+
+    def flush(self):
+        """Write the progress out if it changed. Returns True if anything was written."""
+        if not self.dirty:
+            return False
+        up = self.upgrades
+        scores = self.scores
+        struct.pack_into(RECORD_FORMAT, self.record, 0, SAVE_MAGIC, self.credits,
+                         up[0], up[1], up[2], scores[0], scores[1], scores[2], 0)
+        struct.pack_into('<H', self.record, BODY_SIZE, checksum(self.record, 0))
+        if self.records >= self.log_records:
+            self.compact()
+        else:
+            with open(self.path, 'ab') as f:
+                f.write(self.record)
+            self.records += 1
+        self.dirty = False
+        return True
+
+    def compact(self):
+        """Replace the log with just the current record."""
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(self.record)
+        # LittleFS renames over an existing file in one step
+        os.rename(tmp, self.path)
+        self.records = 1
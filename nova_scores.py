@@ -0,0 +1,25 @@
+"""NovaNaut's high score table, loaded by NovaNaut.show_screen only while it is shown."""
+from nova_platform import thumby, const
+from nova_save import TOP_SCORES
+
+SCREEN_WIDTH = const(72)  # NovaNaut.SCREEN_WIDTH
+SCREEN_HEIGHT = const(40)  # NovaNaut.SCREEN_HEIGHT
+
+def show(game):
+    while True:
+        thumby.display.fill(0)
+
+        text = "HIGH SCORES"
+        x = (SCREEN_WIDTH - len(text) * 6) // 2
+        thumby.display.drawText(text, x, 0, 1)
+
+        for i in range(TOP_SCORES):
+            score = f"{i + 1}. {game.state.high_scores[i]}"
+            thumby.display.drawText(score, 8, 8 + i * 8, 1)
+
+        thumby.display.drawText("B:BACK", 2, SCREEN_HEIGHT - 8, 1)
+
+        thumby.display.update()
+
+        if thumby.buttonB.justPressed():
+            return
@@ -0,0 +1,64 @@
+"""Packed sprite sheet for NovaNaut.
+
+Every bitmap lives in one binary file, novanaut.spr, built by
+tools/build_sprites.py. The file is a header, an index of SHEET_ENTRY
+records (name, offset, width, height), then the bitmaps in the Thumby's
+column-per-byte page layout. load() reads the whole file with one
+readinto into a buffer sized to it. bitmap() and sprite() hand out
+memoryview slices of that buffer, so sprites share it instead of each
+holding a copy, and more sprites don't mean more allocations at import.
+"""
+import os
+import struct
+from nova_platform import thumby
+
+SHEET_MAGIC = b'NSPR'
+SHEET_HEADER = '<4sB'  # magic, entry count
+SHEET_ENTRY = '<8sHBB'  # name padded with zeros, offset from the file start, width, height
+HEADER_SIZE = struct.calcsize(SHEET_HEADER)
+ENTRY_SIZE = struct.calcsize(SHEET_ENTRY)
+
+class SpriteSheet:
+    __slots__ = ('buffer', 'count')
+
+    def __init__(self, path=None):
+        self.buffer = None
+        self.count = 0
+        if path:
+            self.load(path)
+
+    def load(self, path):
+        size = os.stat(path)[6]
+        buf = bytearray(size)
+        with open(path, 'rb') as f:
+            f.readinto(buf)
+        magic, count = struct.unpack_from(SHEET_HEADER, buf, 0)
+        if magic != SHEET_MAGIC or HEADER_SIZE + count * ENTRY_SIZE > size:
+            raise ValueError('bad sprite sheet ' + path)
+        self.buffer = buf
+        self.count = count
+
+    def bitmap(self, name):
+        """The named bitmap as a memoryview into the sheet. Returns (bitmap, width, height).
+
+        The index is scanned in place rather than kept as a dict, so the
+        sheet costs the same two allocations however many sprites it holds.
+        """
+        key = name.encode()
+        buf = self.buffer
+        for i in range(self.count):
+            entry, offset, width, height = struct.unpack_from(SHEET_ENTRY, buf, HEADER_SIZE + i * ENTRY_SIZE)
+            if entry.rstrip(b'\0') == key:
+                end = offset + width * ((height + 7) >> 3)
+                return memoryview(buf)[offset:end], width, height
+        raise KeyError(name)
+
+    def sprite(self, name):
+        bitmap, width, height = self.bitmap(name)
+        # thumby.Sprite only takes a file path or a bytearray, so give it the
+        # sheet (wrapped, not copied) and then point it at this slice
+        sprite = thumby.Sprite(width, height, self.buffer)
+        sprite.bitmapSource = bitmap
+        sprite.bitmap = bitmap
+        sprite.frameCount = 1
+        return sprite
@@ -0,0 +1,55 @@
+"""Fixed-point trig tables for NovaNaut.
+
+Angles are integer steps, ANGLE_STEPS to a full turn, and sines and
+cosines are integers scaled by TRIG_ONE, so hot paths do a table lookup
+and a shift instead of calling math.sin/math.cos on floats. The shield
+ring and spread-shot vectors the game draws and fires are precomputed
+here too.
+"""
+import math
+from array import array
+from nova_platform import const
+
+ANGLE_STEPS = const(64)
+ANGLE_MASK = const(ANGLE_STEPS - 1)
+QUARTER_TURN = const(ANGLE_STEPS // 4)
+TRIG_SHIFT = const(8)
+TRIG_ONE = const(1 << TRIG_SHIFT)
+
+# SIN[step] = sin(step / ANGLE_STEPS * 2pi) * TRIG_ONE, rounded
+SIN = array('h', [round(math.sin(i * 2 * math.pi / ANGLE_STEPS) * TRIG_ONE)
+                  for i in range(ANGLE_STEPS)])
+
+def sin(step):
+    return SIN[step & ANGLE_MASK]
+
+def cos(step):
+    return SIN[(step + QUARTER_TURN) & ANGLE_MASK]
+
+# Shield ring: SHIELD_SEGMENTS vertices at SHIELD_RADIUS pixels. Turning the
+# ring by one segment gives the same ring, so only the first SHIELD_PHASES
+# rotation steps are stored. Vertex i of phase p is at index
+# p * SHIELD_SEGMENTS + i. The ring turns one step every SHIELD_STEP_MS.
+SHIELD_SEGMENTS = const(8)
+SHIELD_RADIUS = const(8)
+SHIELD_PHASES = const(ANGLE_STEPS // SHIELD_SEGMENTS)
+SHIELD_STEP_MS = const(20)
+SHIELD_X = array('b')
+SHIELD_Y = array('b')
+for _phase in range(SHIELD_PHASES):
+    for _i in range(SHIELD_SEGMENTS):
+        _step = _i * SHIELD_PHASES + _phase
+        SHIELD_X.append((cos(_step) * SHIELD_RADIUS) >> TRIG_SHIFT)
+        SHIELD_Y.append((sin(_step) * SHIELD_RADIUS) >> TRIG_SHIFT)
+del _phase, _i, _step
+
+# Spread shot: each bullet's velocity in the game's bullet fixed point,
+# rounded once here so the up and down shots mirror each other exactly.
+# 15 degrees is not a whole number of ANGLE_STEPS, so these come from math.
+SPREAD_SHIFT = const(6)  # NovaNaut.FP_SHIFT
+SPREAD_SPEED = const(3)  # Pixels per frame along the shot
+SPREAD_ANGLES = (-15, 0, 15)
+SPREAD_DX = array('h', [round(SPREAD_SPEED * math.cos(math.radians(a)) * (1 << SPREAD_SHIFT))
+                        for a in SPREAD_ANGLES])
+SPREAD_DY = array('h', [round(math.sin(math.radians(a)) * (1 << SPREAD_SHIFT))
+                        for a in SPREAD_ANGLES])
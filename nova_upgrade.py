@@ -0,0 +1,53 @@
+"""NovaNaut's upgrade shop, loaded by NovaNaut.show_screen only while it is shown."""
+from nova_platform import thumby, const
+
+SCREEN_WIDTH = const(72)  # NovaNaut.SCREEN_WIDTH
+SCREEN_HEIGHT = const(40)  # NovaNaut.SCREEN_HEIGHT
+UPGRADE_COST = const(50)
+MAX_UPGRADE_LEVEL = const(3)
+UPGRADES = (("SPEED", 'speed'), ("POWER", 'power'), ("SHIELD", 'shield'))
+
+def show(game):
+    """Spend credits on upgrades until B, then save them."""
+    state = game.state
+    selected = 0
+
+    while True:
+        thumby.display.fill(0)
+
+        thumby.display.drawText("UPGRADES", 16, 0, 1)
+        thumby.display.drawText(f"Credits: {state.credits}", 8, 8, 1)
+
+        for i, (name, key) in enumerate(UPGRADES):
+            y = 20 + i * 8
+            level = state.upgrades[key]
+            cost = UPGRADE_COST * (level + 1)
+
+            if i == selected:
+                thumby.display.drawRectangle(0, y - 1, SCREEN_WIDTH, 9, 1)
+
+            text = f"{name}: {level}/{MAX_UPGRADE_LEVEL} ({cost})"
+            thumby.display.drawText(text, 2, y, 1 if i != selected else 0)
+
+        thumby.display.drawText("B:BACK", 2, SCREEN_HEIGHT - 8, 1)
+        thumby.display.update()
+
+        if thumby.buttonU.justPressed() and selected > 0:
+            selected -= 1
+            thumby.audio.play(800, 50)
+        elif thumby.buttonD.justPressed() and selected < len(UPGRADES) - 1:
+            selected += 1
+            thumby.audio.play(800, 50)
+        elif thumby.buttonA.justPressed():
+            key = UPGRADES[selected][1]
+            level = state.upgrades[key]
+            cost = UPGRADE_COST * (level + 1)
+
+            if level < MAX_UPGRADE_LEVEL and state.credits >= cost:
+                state.credits -= cost
+                state.upgrades[key] += 1
+                thumby.audio.play(1000, 100)
+        elif thumby.buttonB.justPressed():
+            game.save.capture(state)
+            game.save.flush()
+            return
@@ -0,0 +1,399 @@
+"""Play many seeded NovaNaut games headless in parallel for balance sweeps.
+
+Each game is driven by a scripted autopilot that sets the buttons before
+every handle_input(): it lines up with the nearest alien ahead and holds
+B, sidesteps aliens about to reach it, charges A while the gun cools and
+picks up power-ups when nothing is coming. Games run across a process
+pool, one NovaNaut per worker, and each result is written to a JSON
+lines file as soon as it comes back, so nothing is held in memory but
+the running totals. A summary table of survival time, wave reached,
+score, overheats and kills per wave is printed at the end.
+
+    python tools/batch_sim.py --games 2000 -o base.jsonl
+    python tools/batch_sim.py --games 2000 --set POWER_UP_CHANCE=77 -o more_powerups.jsonl
+    python tools/batch_sim.py --games 500 --campaign 5 --set UPGRADE_COST=30
+    python tools/batch_sim.py --summarize base.jsonl
+
+--set NAME=VALUE overrides a constant in NovaNaut, nova_upgrade or
+nova_levels (first module that has it; VALUE is a Python literal) before
+any game starts. Headless, const() returns its argument, so any constant
+read at run time can be changed this way: POWER_UP_CHANCE, COMBO_TIMEOUT,
+HEAT_PER_SHOT, UPGRADE_COST, WAVE_ENEMY_STEP, LEVELS and so on.
+--campaign N plays N games in a row per seed, spending the credits
+between games the way the upgrade shop does, so UPGRADE_COST shows up in
+the later games.
+
+The same seed and settings always give the same game, drawn or not;
+games are only drawn with --draw, which is much slower.
+"""
+import argparse
+import ast
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import headless
+
+thumby = headless.install()
+
+import NovaNaut  # noqa: E402
+import nova_levels  # noqa: E402
+import nova_upgrade  # noqa: E402
+
+FRAME_US = 1000000 // NovaNaut.FPS
+TUNABLE_MODULES = (NovaNaut, nova_upgrade, nova_levels)
+METRICS = ('seconds', 'wave', 'score', 'kills', 'overheats')
+
+# Autopilot tuning, in pixels
+HOME_X = 6  # Where the player hangs back when not fetching a power-up
+DODGE_RANGE = 10  # Gap ahead of the nose within which an alien in our rows is dodged
+AIM_SLACK = 2  # Rows off the aim line the autopilot stops steering at
+BULLET_ROW = 5  # fire_bullet's single shot leaves at player.y + 5
+
+
+# === AUTOPILOT ===
+
+def _rows_overlap(y0, h0, y1, h1):
+    return y0 < y1 + h1 and y1 < y0 + h0
+
+
+def autopilot(game):
+    """Return this frame's buttons (as for headless.set_buttons) from the game state."""
+    state = game.state
+    px = game.player.x
+    py = game.player.y
+    nose = px + NovaNaut.PLAYER_MASK.x + NovaNaut.PLAYER_MASK.width
+    player_top = py + NovaNaut.PLAYER_MASK.y
+    player_height = NovaNaut.PLAYER_MASK.height
+
+    target = None
+    threat = None
+    for alien in game.aliens:
+        mask = NovaNaut.ALIEN_MASKS[alien.type]
+        if alien.x + mask.x + mask.width <= px:
+            continue  # Already behind us
+        if target is None or alien.x < target.x:
+            target = alien
+        if (alien.x + mask.x - nose < DODGE_RANGE
+                and _rows_overlap(player_top, player_height, alien.y + mask.y, mask.height)
+                and (threat is None or alien.x < threat.x)):
+            threat = alien
+
+    aim = None
+    if target is not None:
+        mask = NovaNaut.ALIEN_MASKS[target.type]
+        aim = target.y + mask.y + mask.height // 2 - BULLET_ROW
+
+    buttons = ''
+    fetch = None
+    if threat is not None:
+        mask = NovaNaut.ALIEN_MASKS[threat.type]
+        threat_mid = threat.y + mask.y + mask.height // 2
+        room_above = player_top
+        room_below = NovaNaut.SCREEN_HEIGHT - (player_top + player_height)
+        # Away from the alien's middle, unless the wall is in the way
+        up = player_top + player_height // 2 >= threat_mid
+        if up and room_above <= 1 or not up and room_below <= 1:
+            up = not up
+        buttons += 'U' if up else 'D'
+    elif aim is not None:
+        if py > aim + AIM_SLACK - 1:
+            buttons += 'U'
+        elif py < aim - AIM_SLACK + 1:
+            buttons += 'D'
+    elif game.powerups and state.current_powerup is None:
+        fetch = game.powerups[0]
+        if py > fetch.y:
+            buttons += 'U'
+        elif py + player_height < fetch.y:
+            buttons += 'D'
+
+    home = fetch.x if fetch is not None else HOME_X
+    if px > home + 1:
+        buttons += 'L'
+    elif px < home - 1:
+        buttons += 'R'
+
+    if state.overheated:
+        buttons += 'A'  # Charge while the gun cools; letting go fires the charged shot
+    elif aim is not None and abs(py - aim) <= AIM_SLACK + 2:
+        buttons += 'B'
+    return buttons
+
+
+# === WORKER ===
+
+game = None
+counts = None
+
+
+def apply_overrides(overrides):
+    for name, value in overrides:
+        if '.' in name:
+            module_name, attr = name.rsplit('.', 1)
+            module = sys.modules.get(module_name)
+            if module is None or not hasattr(module, attr):
+                raise KeyError(name)
+            setattr(module, attr, value)
+            continue
+        for module in TUNABLE_MODULES:
+            if hasattr(module, name):
+                setattr(module, name, value)
+                break
+        else:
+            raise KeyError(name)
+
+
+def init_worker(overrides):
+    """Build the one game a worker reuses, counting kills per wave on the instance."""
+    global game, counts
+    apply_overrides(overrides)
+    headless.reset()
+    game = NovaNaut.NovaNaut()
+    counts = {'kills': []}
+    destroyed = game.handle_alien_destroyed
+
+    def counted(alien):
+        kills = counts['kills']
+        wave = game.state.wave_number
+        while len(kills) < wave:
+            kills.append(0)
+        kills[wave - 1] += 1
+        destroyed(alien)
+
+    game.handle_alien_destroyed = counted
+
+
+def buy_upgrades(state):
+    """Spend credits the way the shop allows, cheapest upgrade first."""
+    while True:
+        best = None
+        for _, key in nova_upgrade.UPGRADES:
+            level = state.upgrades[key]
+            cost = nova_upgrade.UPGRADE_COST * (level + 1)
+            if level < nova_upgrade.MAX_UPGRADE_LEVEL and cost <= state.credits:
+                if best is None or cost < best[0]:
+                    best = (cost, key)
+        if best is None:
+            return
+        state.credits -= best[0]
+        state.upgrades[best[1]] += 1
+
+
+def play(seed, max_frames, draw):
+    """One game from reset to the last life (or max_frames) with the autopilot."""
+    headless.reset()
+    state = game.state
+    game.reset_game_state(seed)
+    counts['kills'] = []
+    upgrades = dict(state.upgrades)
+    credits = state.credits
+    game.start_new_wave()
+
+    frames = 0
+    overheats = 0
+    was_overheated = False
+    while state.lives > 0 and frames < max_frames:
+        headless.set_buttons(autopilot(game))
+        game.handle_input()
+        game.update()
+        game.check_wave_completion()
+        if draw:
+            game.draw()
+        headless.clock.advance_us(FRAME_US)
+        frames += 1
+        if state.overheated and not was_overheated:
+            overheats += 1
+        was_overheated = state.overheated
+
+    kills = counts['kills']
+    while len(kills) < state.wave_number:
+        kills.append(0)
+    return {
+        'seed': seed,
+        'frames': frames,
+        'seconds': round(frames / NovaNaut.FPS, 2),
+        'timed_out': state.lives > 0,
+        'wave': state.wave_number,
+        'score': state.score,
+        'kills': sum(kills),
+        'kills_per_wave': kills,
+        'overheats': overheats,
+        'credits_earned': state.credits - credits,
+        'upgrades': upgrades,
+    }
+
+
+def play_run(job):
+    """A seed's games: one, or a campaign with the shop between games."""
+    seed, campaign, max_frames, draw = job
+    state = game.state
+    state.credits = 0
+    state.upgrades = {'speed': 0, 'power': 0, 'shield': 0}
+    results = []
+    for n in range(campaign):
+        result = play(seed * campaign + n, max_frames, draw)
+        result['run'] = seed
+        result['game'] = n
+        results.append(result)
+        buy_upgrades(state)
+    return results
+
+
+# === SUMMARY ===
+
+class Summary:
+    """Running totals over results, so none of them need to be kept."""
+
+    def __init__(self):
+        self.games = 0
+        self.timed_out = 0
+        self.stats = {name: [0, 0.0, 0.0, None, None] for name in METRICS}  # n, mean, M2, min, max
+        self.reached = []
+        self.died = []
+        self.wave_kills = []
+
+    def add(self, result):
+        self.games += 1
+        self.timed_out += result['timed_out']
+        for name, stat in self.stats.items():
+            value = result[name]
+            stat[0] += 1
+            delta = value - stat[1]
+            stat[1] += delta / stat[0]
+            stat[2] += delta * (value - stat[1])
+            stat[3] = value if stat[3] is None else min(stat[3], value)
+            stat[4] = value if stat[4] is None else max(stat[4], value)
+        wave = result['wave']
+        while len(self.reached) < wave:
+            self.reached.append(0)
+            self.died.append(0)
+            self.wave_kills.append(0)
+        for i in range(wave):
+            self.reached[i] += 1
+            self.wave_kills[i] += result['kills_per_wave'][i]
+        if not result['timed_out']:
+            self.died[wave - 1] += 1
+
+    def as_dict(self):
+        metrics = {}
+        for name, (n, mean, m2, low, high) in self.stats.items():
+            metrics[name] = {
+                'mean': round(mean, 2),
+                'sd': round(math.sqrt(m2 / (n - 1)), 2) if n > 1 else 0.0,
+                'min': low,
+                'max': high,
+            }
+        waves = []
+        for i, reached in enumerate(self.reached):
+            waves.append({
+                'wave': i + 1,
+                'reached': reached,
+                'died': self.died[i],
+                'kills': round(self.wave_kills[i] / reached, 2),
+            })
+        return {'games': self.games, 'timed_out': self.timed_out,
+                'metrics': metrics, 'waves': waves}
+
+    def table(self):
+        summary = self.as_dict()
+        lines = [f"{summary['games']} games, {summary['timed_out']} still alive at the frame limit", '',
+                 f"{'':<12}{'mean':>10}{'sd':>10}{'min':>10}{'max':>10}"]
+        for name, m in summary['metrics'].items():
+            lines.append(f"{name:<12}{m['mean']:>10}{m['sd']:>10}{m['min']:>10}{m['max']:>10}")
+        lines += ['', f"{'wave':<12}{'reached':>10}{'died':>10}{'kills':>10}"]
+        for w in summary['waves']:
+            lines.append(f"{w['wave']:<12}{w['reached']:>10}{w['died']:>10}{w['kills']:>10}")
+        return '\n'.join(lines)
+
+
+def summarize(path):
+    summary = Summary()
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                summary.add(json.loads(line))
+    return summary
+
+
+# === DRIVER ===
+
+def parse_override(text):
+    name, sep, value = text.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError('expected NAME=VALUE: ' + text)
+    try:
+        return name.strip(), ast.literal_eval(value.strip())
+    except (ValueError, SyntaxError):
+        raise argparse.ArgumentTypeError('VALUE must be a Python literal: ' + text)
+
+
+def run(args):
+    jobs = [(seed, args.campaign, args.max_frames, args.draw)
+            for seed in range(args.seed, args.seed + args.games)]
+    summary = Summary()
+    start = time.perf_counter()
+    with open(args.output, 'w') as out, multiprocessing.Pool(
+            args.workers, init_worker, (args.set,)) as pool:
+        for results in pool.imap_unordered(play_run, jobs, args.chunk):
+            for result in results:
+                out.write(json.dumps(result) + '\n')
+                summary.add(result)
+            out.flush()
+    elapsed = time.perf_counter() - start
+    return summary, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=1000, help='seeds to play')
+    parser.add_argument('--seed', type=int, default=0, help='first seed')
+    parser.add_argument('--campaign', type=int, default=1, metavar='N',
+                        help='games in a row per seed, buying upgrades in between')
+    parser.add_argument('--max-frames', type=int, default=NovaNaut.FPS * 300,
+                        help='end a game that is still going after this many frames')
+    parser.add_argument('--draw', action='store_true', help='draw every frame too')
+    parser.add_argument('--set', type=parse_override, action='append', default=[],
+                        metavar='NAME=VALUE', help='override a game constant')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='processes')
+    parser.add_argument('--chunk', type=int, default=4, help='seeds handed to a worker at a time')
+    parser.add_argument('-o', '--output', default='batch.jsonl', help='JSON lines file, one game per line')
+    parser.add_argument('--json', action='store_true', help='print the summary as JSON')
+    parser.add_argument('--summarize', metavar='FILE', help='summarize an earlier results file and exit')
+    args = parser.parse_args(argv)
+
+    if args.summarize:
+        summary = summarize(args.summarize)
+        print(json.dumps(summary.as_dict(), indent=2) if args.json else summary.table())
+        return
+    try:
+        apply_overrides(args.set)  # Fail here rather than in every worker
+    except KeyError as e:
+        parser.error('no such constant: %s' % e.args[0])
+
+    summary, elapsed = run(args)
+    games = summary.games
+    if args.json:
+        result = summary.as_dict()
+        result.update({
+            'settings': {name: value for name, value in args.set},
+            'workers': args.workers,
+            'seconds': round(elapsed, 2),
+            'games_per_minute': round(games * 60 / elapsed, 1),
+        })
+        print(json.dumps(result, indent=2))
+    else:
+        print(summary.table())
+        print(f"\n{games} games in {elapsed:.1f}s on {args.workers} workers: "
+              f"{games * 60 / elapsed:.0f} games/min, results in {args.output}")
+
+
+if __name__ == '__main__':
+    main()
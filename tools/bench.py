@@ -0,0 +1,322 @@
+"""Headless benchmark suite for NovaNaut.
+
+Runs NovaNaut.update()/draw() against the stand-in thumby module in
+tools/headless.py through a set of scripted scenarios and reports, per
+scenario, ticks/sec, per-subsystem time and allocations per frame as JSON.
+
+    python tools/bench.py                       # all scenarios, JSON to stdout
+    python tools/bench.py -o before.json        # write results to a file
+    python tools/bench.py --compare before.json after.json
+
+Timing and allocation tracking run as separate passes so tracemalloc does
+not distort the timings. Numbers are CPython numbers: compare them between
+commits, not against the device.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import headless
+
+thumby = headless.install()
+
+import NovaNaut  # noqa: E402
+
+FRAME_US = 1000000 // NovaNaut.FPS
+
+# Methods timed individually. Anything missing on the instance is skipped so
+# the list can name stages that only exist in some versions of the game.
+UPDATE_STAGES = (
+    'update_player_position', 'update_bullets', 'update_aliens', 'update_stars',
+    'check_collisions', 'update_powerups', 'update_floating_texts', 'update_heat',
+)
+DRAW_STAGES = (
+    'draw_stars', 'draw_shield', 'apply_shake', 'draw_charge_bar', 'draw_powerups',
+    'draw_powerup_indicator', 'draw_combo_indicator', 'draw_wave_announcement',
+    'draw_floating_texts', 'draw_hud', 'draw_heat_gauge', 'draw_flash_effect',
+)
+
+
+# === SCENARIOS ===
+# Each scenario is (setup, tick). setup(game) runs once after a fresh game is
+# built; tick(game, frame) runs before every frame to hold the load steady.
+
+def _pin(game):
+    game.state.lives = 3
+
+
+def empty_setup(game):
+    game.state.wave_enemies = 0
+
+
+def empty_tick(game, frame):
+    _pin(game)
+
+
+def full_wave_setup(game):
+    game.state.wave_number = 8
+    game.max_aliens = min(5 + game.state.wave_number, 8)
+    game.state.wave_enemies = 0
+
+
+def full_wave_tick(game, frame):
+    _pin(game)
+    types = (NovaNaut.ALIEN_BASIC, NovaNaut.ALIEN_SCOUT, NovaNaut.ALIEN_ELITE)
+    while len(game.aliens) < game.max_aliens:
+        game.spawn_alien(types[frame % 3], random.randint(0, NovaNaut.SCREEN_HEIGHT - 8))
+        frame += 1
+
+
+def boss_wave_setup(game):
+    # Level 8 from its compiled, seeded schedule, ending with the boss
+    game.level_seed = 1
+    game.state.wave_number = 7
+    game.start_new_wave()
+
+
+def boss_wave_tick(game, frame):
+    _pin(game)
+    headless.set_buttons('B' if frame % 4 else '')
+    game.state.heat_level = 0
+    if game.state.wave_enemies <= 0 and not game.aliens:
+        game.schedule.compile(game.state.wave_number, game.level_seed)
+        game.state.wave_enemies = game.schedule.count
+
+
+def spray_setup(game):
+    game.state.wave_enemies = 0
+    headless.set_buttons('B')
+    game.state.current_powerup = NovaNaut.PowerUp('MULTI', 0, 0)
+    game.state.current_powerup.collect()
+
+
+def spray_tick(game, frame):
+    _pin(game)
+    headless.set_buttons('B' + ('U' if (frame // 20) % 2 else 'D'))
+    game.state.heat_level = 0
+    game.state.current_powerup.timer = NovaNaut.POWERUP_DURATION
+
+
+def storm_setup(game):
+    game.state.wave_enemies = 0
+
+
+def storm_tick(game, frame):
+    _pin(game)
+    for i in range(2):
+        alien = game.spawn_alien(NovaNaut.ALIEN_BASIC, (frame * 7 + i * 13) % (NovaNaut.SCREEN_HEIGHT - 8))
+        alien.x = 20 + (frame * 11 + i * 17) % 40
+        game.handle_alien_destroyed(alien)
+
+
+def effects_setup(game):
+    game.state.wave_enemies = 0
+
+
+def effects_tick(game, frame):
+    _pin(game)
+    game.state.shield_active = True
+    game.state.shield_power = 100
+    game.state.flash_frames = NovaNaut.FLASH_INTERVAL
+    game.state.shake_frames = NovaNaut.SHAKE_DURATION
+
+
+SCENARIOS = {
+    'empty': (empty_setup, empty_tick),
+    'full_wave': (full_wave_setup, full_wave_tick),
+    'boss_wave': (boss_wave_setup, boss_wave_tick),
+    'machine_gun_spray': (spray_setup, spray_tick),
+    'particle_storm': (storm_setup, storm_tick),
+    'shield_flash': (effects_setup, effects_tick),
+}
+
+
+# === HARNESS ===
+
+class StageTimer:
+    """Wraps bound methods on an object and accumulates their time."""
+
+    def __init__(self):
+        self.totals = {}
+
+    def wrap(self, obj, attr, name=None):
+        fn = getattr(obj, attr, None)
+        if fn is None:
+            return
+        name = name or attr
+        self.totals[name] = 0
+        totals = self.totals
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            t0 = clock()
+            result = fn(*args, **kwargs)
+            totals[name] += clock() - t0
+            return result
+
+        setattr(obj, attr, timed)
+
+
+def new_game(scenario, seed):
+    headless.reset()
+    random.seed(seed)
+    game = NovaNaut.NovaNaut()
+    game.reset_game_state(seed)
+    setup, tick = SCENARIOS[scenario]
+    setup(game)
+    return game, tick
+
+
+def frame(game, tick, n):
+    tick(game, n)
+    game.handle_input()
+    game.update()
+    game.draw()
+    headless.clock.advance_us(FRAME_US)
+
+
+def time_scenario(scenario, ticks, warmup, seed):
+    game, tick = new_game(scenario, seed)
+    for n in range(warmup):
+        frame(game, tick, n)
+
+    stages = StageTimer()
+    for attr in UPDATE_STAGES + DRAW_STAGES:
+        stages.wrap(game, attr)
+    stages.wrap(game.particles, 'update', 'particles.update')
+    stages.wrap(game.particles, 'draw', 'particles.draw')
+    stages.wrap(thumby.display, 'update', 'display.update')
+
+    frame_ns = []
+    clock = time.perf_counter_ns
+    for n in range(warmup, warmup + ticks):
+        t0 = clock()
+        frame(game, tick, n)
+        frame_ns.append(clock() - t0)
+
+    # Undo the wrapper on the shared stand-in display.
+    del thumby.display.update
+
+    total = sum(frame_ns)
+    frame_ns.sort()
+    budget_ns = FRAME_US * 1000
+    return {
+        'ticks': ticks,
+        'ticks_per_sec': round(ticks * 1e9 / total, 1),
+        'frame_us': {
+            'mean': round(total / ticks / 1000, 2),
+            'p50': round(frame_ns[ticks // 2] / 1000, 2),
+            'p95': round(frame_ns[int(ticks * 0.95)] / 1000, 2),
+            'max': round(frame_ns[-1] / 1000, 2),
+        },
+        'frames_over_budget': sum(1 for t in frame_ns if t > budget_ns),
+        'subsystem_us': {k: round(v / ticks / 1000, 2) for k, v in stages.totals.items()},
+        'load': {
+            'aliens': len(game.aliens),
+            'bullets': len(game.bullets),
+            'particles': game.particles.count,
+        },
+    }
+
+
+def alloc_scenario(scenario, ticks, warmup, seed):
+    game, tick = new_game(scenario, seed)
+    for n in range(warmup):
+        frame(game, tick, n)
+
+    peak = 0
+    blocks = 0
+    tracemalloc.start()
+    for n in range(warmup, warmup + ticks):
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        b0 = sys.getallocatedblocks()
+        frame(game, tick, n)
+        blocks += sys.getallocatedblocks() - b0
+        peak += tracemalloc.get_traced_memory()[1] - start
+    tracemalloc.stop()
+    return {
+        'peak_bytes_per_frame': round(peak / ticks, 1),
+        'net_blocks_per_frame': round(blocks / ticks, 2),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(HERE),
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scenarios, ticks, warmup, seed):
+    results = {}
+    for name in scenarios:
+        result = time_scenario(name, ticks, warmup, seed)
+        result['allocations'] = alloc_scenario(name, min(ticks, 300), warmup, seed)
+        results[name] = result
+    return {
+        'revision': git_revision(),
+        'python': platform.python_implementation() + ' ' + platform.python_version(),
+        'fps_budget_us': FRAME_US,
+        'seed': seed,
+        'scenarios': results,
+    }
+
+
+def compare(base_path, new_path):
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{'scenario':<20}{'base t/s':>12}{'new t/s':>12}{'change':>10}")
+    for name, result in new['scenarios'].items():
+        old = base['scenarios'].get(name)
+        if old is None:
+            continue
+        a = old['ticks_per_sec']
+        b = result['ticks_per_sec']
+        print(f"{name:<20}{a:>12.1f}{b:>12.1f}{(b / a - 1) * 100:>+9.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+                        help='scenarios to run (default: all of %s)' % ', '.join(SCENARIOS))
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--warmup', type=int, default=120)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('-o', '--output', help='write JSON results to this file')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'),
+                        help='print the ticks/sec change between two result files')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error('unknown scenario: ' + name)
+
+    results = run(args.scenarios or list(SCENARIOS), args.ticks, args.warmup, args.seed)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
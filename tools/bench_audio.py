@@ -0,0 +1,185 @@
+"""Benchmark and check the nova_audio mixer and music sequencer.
+
+Checks that several sounds queued in one frame reach the hardware as a
+single call for the highest-priority one, and that a lower-priority
+sound doesn't cut off a higher one that is still playing. It checks that
+THEME's notes start on the frames the song says, and that update()
+holds on to no memory. Then it times update() and plays a seeded game,
+counting how many sound requests there were and how many hardware calls
+the mixer made for them. Before the mixer, every request was a hardware
+call.
+
+    python tools/bench_audio.py [--frames 3000] [--iterations 20000] [--repeats 7]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import headless
+
+thumby = headless.install()
+
+import NovaNaut  # noqa: E402
+from nova_audio import (AudioMixer, NOTE_FREQ, SOUND_FREQ, SOUND_FRAMES, THEME,  # noqa: E402
+                        SND_SHOT, SND_KILL, SND_POWERUP, SND_HIT)
+
+calls = []
+
+
+def record(freq, duration):
+    calls.append((freq, duration))
+
+
+def check():
+    """Return a list of failed checks; empty when everything holds."""
+    failures = []
+    thumby.audio.play = record
+    mixer = AudioMixer()
+
+    calls.clear()
+    for sound in (SND_SHOT, SND_KILL, SND_HIT, SND_KILL, SND_SHOT):
+        mixer.play(sound)
+    mixer.update()
+    if [c[0] for c in calls] != [SOUND_FREQ[SND_HIT]]:
+        failures.append('a frame of requests did not coalesce to the highest priority')
+
+    calls.clear()
+    for _ in range(SOUND_FRAMES[SND_HIT] - 1):
+        mixer.play(SND_SHOT)
+        mixer.update()
+    if calls:
+        failures.append('a shot cut off the hit sound')
+    mixer.play(SND_SHOT)
+    mixer.update()
+    if [c[0] for c in calls] != [SOUND_FREQ[SND_SHOT]]:
+        failures.append('a shot did not play once the hit sound ended')
+
+    calls.clear()
+    mixer.reset()
+    mixer.start_music(THEME)
+    expected = []
+    frame = 0
+    for pos in range(0, len(THEME), 2):
+        if THEME[pos]:
+            expected.append((frame, NOTE_FREQ[THEME[pos]]))
+        frame += THEME[pos + 1]
+    heard = []
+    for f in range(frame):
+        before = len(calls)
+        mixer.update()
+        if len(calls) > before:
+            heard.append((f, calls[-1][0]))
+    if heard != expected:
+        failures.append('music notes did not start on their frames')
+
+    calls.clear()
+    mixer.start_music(THEME)
+    mixer.play(SND_POWERUP)
+    mixer.update()
+    if [c[0] for c in calls] != [SOUND_FREQ[SND_POWERUP]]:
+        failures.append('a sound effect did not take over from the music')
+
+    # CPython boxes ints above 256, which MicroPython doesn't, so rather
+    # than expecting zero allocations check that nothing builds up. The
+    # counters start past CPython's cached ints so they don't show up as growth.
+    thumby.audio.play = noop
+    mixer.played = mixer.dropped = 1 << 20
+    tracemalloc.start()
+    used = []
+    for _ in range(3):
+        for f in range(5000):
+            if f % 7 == 0:
+                mixer.play(f % 6)
+            mixer.update()
+        used.append(tracemalloc.get_traced_memory()[0])
+    tracemalloc.stop()
+    if used[1] != used[2]:
+        failures.append('update() kept memory')
+    return failures
+
+
+def noop(freq, duration):
+    pass
+
+
+def best_us(fn, iterations, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter_ns()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter_ns() - t0) / iterations / 1000)
+    return best
+
+
+def play_game(frames):
+    """Requests and hardware calls over a seeded game with scripted input."""
+    headless.reset()
+    random.seed(1)
+    thumby.audio.play = record
+    game = NovaNaut.NovaNaut()
+    game.reset_game_state(1)
+    game.start_new_wave()
+    audio = game.audio
+    audio.reset()
+    calls.clear()
+    busy_frames = 0
+    for f in range(frames):
+        if f % 15 == 0:
+            headless.set_buttons(''.join(random.sample('UDLRAB', 2)))
+        game.state.lives = 3
+        requests = audio.played + audio.dropped
+        game.handle_input()
+        game.update()
+        game.check_wave_completion()
+        if audio.played + audio.dropped + (audio.pending >= 0) - requests > 1:
+            busy_frames += 1
+        audio.update()
+    thumby.audio.play = noop
+    return {
+        'frames': frames,
+        'sound_requests': audio.played + audio.dropped,
+        'hardware_calls': audio.played,
+        'frames_with_several_requests': busy_frames,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=3000)
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--repeats', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    failures = check()
+    thumby.audio.play = noop
+    mixer = AudioMixer()
+    mixer.start_music(THEME)
+    music_us = best_us(mixer.update, args.iterations, args.repeats)
+
+    def burst():
+        mixer.play(SND_SHOT)
+        mixer.play(SND_KILL)
+        mixer.play(SND_KILL)
+        mixer.update()
+    results = {
+        'failed_checks': failures,
+        'update_music_only_us': round(music_us, 3),
+        'three_requests_and_update_us': round(best_us(burst, args.iterations, args.repeats), 3),
+        'game': play_game(args.frames),
+    }
+    print(json.dumps(results, indent=2))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,285 @@
+"""Check and benchmark nova_render against the display calls it replaced.
+
+The reference functions below are the old per-object drawing code, with
+the same signatures as nova_render's batch calls: drawFilledRectangle
+per bullet, setPixel per particle and drawSprite per alien. The checks
+draw random batches both ways over the same random background and
+compare the framebuffers byte for byte. Bullets, particles and aliens
+are placed across and past every screen edge, and aliens overlap. Then a
+seeded game is played twice, once with each renderer, and every frame
+is compared.
+
+Screen shake is checked too: apply_shake must move every pixel by the
+offset and clear what it uncovers, and on a shaken frame the world must
+be drawn before the move and the UI after it. Finally each batch and the
+shake are timed at full load.
+
+    python tools/bench_render.py [--trials 3000] [--frames 2000] [--iterations 300] [--repeats 5]
+
+The reference side runs on the pure-Python stand-in display, so the
+speedups overstate what the device gains. Compare them between commits,
+not against the device.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import headless
+
+thumby = headless.install()
+
+import NovaNaut  # noqa: E402
+import nova_render  # noqa: E402
+from NovaNaut import (ALIEN_BITMAPS, ALIEN_TYPES, ALIEN_WIDTH, FP_SHIFT,  # noqa: E402
+                      SCREEN_HEIGHT, SCREEN_WIDTH)
+
+SPRITES = [NovaNaut.SPRITE_SHEET.sprite(name) for name in ALIEN_TYPES]
+BUF = thumby.display.display.buffer
+
+
+# === REFERENCE ===
+
+def ref_points(buf, xs, ys, count, shift):
+    set_pixel = thumby.display.setPixel
+    for i in range(count):
+        x = xs[i] >> shift
+        y = ys[i] >> shift
+        if 0 <= x < SCREEN_WIDTH and 0 <= y < SCREEN_HEIGHT:
+            set_pixel(x, y, 1)
+
+
+def ref_bullets(buf, xs, ys, count, shift):
+    fill_rect = thumby.display.drawFilledRectangle
+    for i in range(count):
+        x = xs[i] >> shift
+        y = ys[i] >> shift
+        if 0 <= x < SCREEN_WIDTH - 3 and 0 <= y < SCREEN_HEIGHT - 2:
+            fill_rect(x, y, 3, 2, 1)
+
+
+def ref_aliens(buf, aliens, bitmaps, widths):
+    for alien in aliens:
+        x = int(alien.x)
+        y = int(alien.y)
+        if -16 <= x < SCREEN_WIDTH and -8 <= y < SCREEN_HEIGHT:
+            sprite = SPRITES[alien.type]
+            sprite.x = x
+            sprite.y = y
+            thumby.display.drawSprite(sprite)
+
+
+PAIRS = {
+    'points': (nova_render.plot_points, ref_points),
+    'bullets': (nova_render.draw_bullets, ref_bullets),
+    'aliens': (nova_render.blit_aliens, ref_aliens),
+}
+
+
+# === CHECKS ===
+
+def random_batch(rng, kind):
+    """Arguments after buf for one random call of the given batch kind."""
+    if kind == 'aliens':
+        aliens = []
+        for _ in range(rng.randint(0, NovaNaut.MAX_ALIENS)):
+            alien = NovaNaut.Alien(rng.randrange(len(ALIEN_TYPES)), 0, rng.randint(-10, SCREEN_HEIGHT + 2))
+            alien.x = rng.randint(-20, SCREEN_WIDTH + 2) + rng.choice((0, 0.5, -0.5))
+            aliens.append(alien)
+        return (aliens, ALIEN_BITMAPS, ALIEN_WIDTH)
+    count = rng.randint(0, 64)
+    one = 1 << FP_SHIFT
+    xs = [rng.randint(-5 * one, (SCREEN_WIDTH + 5) * one) for _ in range(count)]
+    ys = [rng.randint(-5 * one, (SCREEN_HEIGHT + 5) * one) for _ in range(count)]
+    return (xs, ys, count, FP_SHIFT)
+
+
+def check_batches(trials, seed=1):
+    """Failing batch kinds over random batches on random backgrounds."""
+    rng = random.Random(seed)
+    failed = set()
+    for _ in range(trials):
+        for kind, (ours, ref) in PAIRS.items():
+            args = random_batch(rng, kind)
+            background = bytes(rng.getrandbits(8) for _ in range(len(BUF)))
+            BUF[:] = background
+            ours(BUF, *args)
+            mine = bytes(BUF)
+            BUF[:] = background
+            ref(BUF, *args)
+            if bytes(BUF) != mine:
+                failed.add(kind)
+    return sorted(failed)
+
+
+def play(seed, frames, reference):
+    """Hash of every frame of a seeded game drawn with one renderer."""
+    saved = (NovaNaut.plot_points, NovaNaut.draw_bullets, NovaNaut.blit_aliens)
+    if reference:
+        NovaNaut.plot_points, NovaNaut.draw_bullets, NovaNaut.blit_aliens = (
+            ref_points, ref_bullets, ref_aliens)
+    try:
+        headless.reset()
+        buttons = random.Random(seed)
+        game = NovaNaut.NovaNaut()
+        game.reset_game_state(seed)
+        game.start_new_wave()
+        digest = hashlib.md5()
+        for f in range(frames):
+            if f % 15 == 0:
+                headless.set_buttons(''.join(buttons.sample('UDLRAB', 2)))
+            game.state.lives = 3
+            game.handle_input()
+            game.update()
+            game.check_wave_completion()
+            game.draw()
+            headless.clock.advance_us(1000000 // NovaNaut.FPS)
+            digest.update(BUF)
+    finally:
+        NovaNaut.plot_points, NovaNaut.draw_bullets, NovaNaut.blit_aliens = saved
+    return digest.hexdigest()
+
+
+WORLD_STAGES = ('draw_stars', 'draw_shield', 'draw_powerups', 'draw_floating_texts')
+UI_STAGES = ('draw_charge_bar', 'draw_powerup_indicator', 'draw_combo_indicator',
+             'draw_wave_announcement', 'draw_hud', 'draw_heat_gauge')
+
+
+def pixel(buf, x, y):
+    if 0 <= x < SCREEN_WIDTH and 0 <= y < SCREEN_HEIGHT:
+        return (buf[(y >> 3) * SCREEN_WIDTH + x] >> (y & 7)) & 1
+    return 0
+
+
+def check_shake_move(trials, seed=1):
+    """apply_shake moves random screens pixel for pixel, clearing the gap."""
+    headless.reset()
+    game = NovaNaut.NovaNaut()
+    rng = random.Random(seed)
+    intensity = NovaNaut.SHAKE_INTENSITY
+    for _ in range(trials):
+        background = bytes(rng.getrandbits(8) for _ in range(len(BUF)))
+        dx = rng.randint(-intensity, intensity)
+        dy = rng.randint(-intensity, intensity)
+        BUF[:] = background
+        game.apply_shake(dx, dy)
+        for y in range(SCREEN_HEIGHT):
+            for x in range(SCREEN_WIDTH):
+                if pixel(BUF, x, y) != pixel(background, x - dx, y - dy):
+                    return False
+    return True
+
+
+def check_shake_order(seed=1):
+    """The world stages run before apply_shake and the UI stages after it."""
+    headless.reset()
+    game = NovaNaut.NovaNaut()
+    game.reset_game_state(seed)
+    game.start_new_wave()
+    calls = []
+    for name in WORLD_STAGES + ('apply_shake',) + UI_STAGES:
+        fn = getattr(game, name)
+        setattr(game, name, lambda *args, fn=fn, name=name: (calls.append(name), fn(*args)))
+    for _ in range(20):  # Until the noise gives a non-zero offset
+        calls.clear()
+        game.state.shake_frames = NovaNaut.SHAKE_DURATION
+        game.draw()
+        if 'apply_shake' in calls:
+            break
+    else:
+        return False
+    shake = calls.index('apply_shake')
+    return (all(calls.index(name) < shake for name in WORLD_STAGES) and
+            all(calls.index(name) > shake for name in UI_STAGES))
+
+
+# === TIMING ===
+
+def full_load(seed=2):
+    """Arguments for a full frame of each batch: every slot in use."""
+    rng = random.Random(seed)
+    one = 1 << FP_SHIFT
+    bullets = NovaNaut.BULLET_CAPACITY
+    particles = NovaNaut.PARTICLE_CAPACITY
+    aliens = []
+    for i in range(NovaNaut.MAX_ALIENS):
+        alien = NovaNaut.Alien(i % len(ALIEN_TYPES), 0, rng.randint(0, SCREEN_HEIGHT - 8))
+        alien.x = rng.randint(0, SCREEN_WIDTH - 8)
+        aliens.append(alien)
+    return {
+        'points': ([rng.randint(0, SCREEN_WIDTH * one - 1) for _ in range(particles)],
+                   [rng.randint(0, SCREEN_HEIGHT * one - 1) for _ in range(particles)],
+                   particles, FP_SHIFT),
+        'bullets': ([rng.randint(0, (SCREEN_WIDTH - 4) * one) for _ in range(bullets)],
+                    [rng.randint(0, (SCREEN_HEIGHT - 3) * one) for _ in range(bullets)],
+                    bullets, FP_SHIFT),
+        'aliens': (aliens, ALIEN_BITMAPS, ALIEN_WIDTH),
+    }
+
+
+def best_us(fn, args, iterations, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter_ns()
+        for _ in range(iterations):
+            fn(BUF, *args)
+        best = min(best, (time.perf_counter_ns() - t0) / iterations / 1000)
+    return best
+
+
+def timings(iterations, repeats):
+    loads = full_load()
+    results = {}
+    for kind, (ours, ref) in PAIRS.items():
+        a = best_us(ours, loads[kind], iterations, repeats)
+        b = best_us(ref, loads[kind], iterations, repeats)
+        results[kind] = {'objects': len(loads[kind][0]), 'batched_us': round(a, 1),
+                         'per_object_us': round(b, 1), 'speedup': round(b / a, 2)}
+    game = NovaNaut.NovaNaut()
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter_ns()
+        for _ in range(iterations):
+            game.apply_shake(1, -1)
+        best = min(best, (time.perf_counter_ns() - t0) / iterations / 1000)
+    results['apply_shake_us'] = round(best, 1)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--trials', type=int, default=3000)
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failed = ['batch_' + kind for kind in check_batches(args.trials)]
+    for seed in (3, 7):
+        if play(seed, args.frames, False) != play(seed, args.frames, True):
+            failed.append('game_seed_%d' % seed)
+    if not check_shake_move(max(1, args.trials // 30)):
+        failed.append('shake_move')
+    if not check_shake_order():
+        failed.append('shake_order')
+
+    results = {
+        'failed_checks': failed,
+        'trials': args.trials,
+        'game_frames': args.frames,
+        'full_load': timings(args.iterations, args.repeats),
+    }
+    print(json.dumps(results, indent=2))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
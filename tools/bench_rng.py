@@ -0,0 +1,196 @@
+"""Benchmark and check nova_rng against the random module.
+
+Checks that Rng runs its full 65535-value period without repeating or
+hitting 0, that the range helpers stay in range, reach both ends and
+come out even, and that a seed gives the same values every time. Then it
+plays a seeded game twice, once drawn and once not, and checks that the
+gameplay stream and the game itself come out the same, so effects don't
+move spawns or drops, and that drawing the same seed twice gives the
+same frames. Finally it times each helper against the random call it
+replaces, best-of-N nanoseconds per call.
+
+    python tools/bench_rng.py [--frames 3000] [--number 20000] [--repeats 7]
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import headless
+
+thumby = headless.install()
+
+import NovaNaut  # noqa: E402
+from nova_rng import NOISE_SIZE, RandomTable, Rng  # noqa: E402
+
+PERIOD = 65535
+UNIFORM_TOLERANCE = 0.02  # Largest bucket deviation from the mean, over a whole period
+SEED = 1234
+
+
+def check_period():
+    rng = Rng(1)
+    seen = bytearray(65536)
+    for _ in range(PERIOD):
+        x = rng.next()
+        if x == 0 or seen[x]:
+            return False
+        seen[x] = 1
+    return rng.state == 1
+
+
+def check_ranges():
+    """Every helper stays in range; Rng's also reach both ends.
+
+    A RandomTable only holds NOISE_SIZE values, so its ends are only
+    checked for small ranges.
+    """
+    rng = Rng(SEED)
+    table = RandomTable()
+    table.fill(Rng(SEED + 1))
+    for n in (1, 2, 5, 7, 72, 256, 65536):
+        values = {rng.below(n) for _ in range(4000)}
+        if min(values) < 0 or max(values) >= n or n <= 256 and len(values) != n:
+            return False
+    for n in (1, 2, 5, 7, 72, 256):
+        values = {table.below(n) for _ in range(NOISE_SIZE)}
+        if min(values) < 0 or max(values) >= n or n <= 8 and len(values) != n:
+            return False
+    for low, high in ((-2, 2), (20, 40), (0, 71)):
+        for source in (rng, table):
+            values = {source.range(low, high) for _ in range(NOISE_SIZE)}
+            if min(values) != low or max(values) != high:
+                return False
+    for n in (1, 2, 8, 16):
+        if not all(0 <= rng.bits(n) < (1 << n) for _ in range(1000)):
+            return False
+    return {rng.choice('abc') for _ in range(100)} == set('abc')
+
+
+def uniformity(n):
+    """Largest relative bucket deviation of below(n) over one full period."""
+    rng = Rng(SEED)
+    counts = [0] * n
+    for _ in range(PERIOD):
+        counts[rng.below(n)] += 1
+    mean = PERIOD / n
+    return max(abs(c - mean) for c in counts) / mean
+
+
+def check_seeds():
+    first = Rng(SEED)
+    second = Rng(SEED)
+    same = all(first.next() == second.next() for _ in range(1000))
+    first = Rng(SEED)
+    other = Rng(SEED + 1)
+    differs = any(first.next() != other.next() for _ in range(10))
+    return same and differs
+
+
+def play(seed, frames, draw):
+    """Gameplay trace and frame hashes of a seeded game with scripted input."""
+    headless.reset()
+    buttons = random.Random(seed)
+    game = NovaNaut.NovaNaut()
+    game.reset_game_state(seed)
+    game.start_new_wave()
+    trace = hashlib.md5()
+    screens = hashlib.md5()
+    for f in range(frames):
+        if f % 15 == 0:
+            headless.set_buttons(''.join(buttons.sample('UDLRAB', 2)))
+        game.state.lives = 3
+        game.handle_input()
+        game.update()
+        game.check_wave_completion()
+        if draw:
+            game.draw()
+            screens.update(thumby.display.display.buffer)
+        headless.clock.advance_us(1000000 // NovaNaut.FPS)
+        state = game.state
+        trace.update(repr((game.rng.state, state.score, state.wave_number, state.credits,
+                           [(a.type, a.x, a.y) for a in game.aliens],
+                           [(p.type, p.x, p.y) for p in game.powerups])).encode())
+    return {
+        'gameplay': trace.hexdigest(),
+        'screens': screens.hexdigest(),
+        'wave': game.state.wave_number,
+        'score': game.state.score,
+    }
+
+
+def best_ns(fn, number, repeats):
+    return min(timeit.repeat(fn, number=number, repeat=repeats)) / number * 1e9
+
+
+def timings(number, repeats):
+    """Per-call cost of each helper next to the random call it replaces."""
+    rng = Rng(SEED)
+    table = RandomTable()
+    table.fill(rng)
+    seq = NovaNaut.POWERUP_TYPES
+    pairs = (
+        ('bits', lambda: rng.bits(8), lambda: random.getrandbits(8)),
+        ('below', lambda: rng.below(72), lambda: random.randrange(72)),
+        ('range', lambda: rng.range(-2, 2), lambda: random.randint(-2, 2)),
+        ('choice', lambda: rng.choice(seq), lambda: random.choice(seq)),
+        ('table_range', lambda: table.range(-2, 2), lambda: random.randint(-2, 2)),
+        ('table_next', lambda: table.next(), lambda: random.getrandbits(8)),
+    )
+    results = {}
+    for name, ours, theirs in pairs:
+        a = best_ns(ours, number, repeats)
+        b = best_ns(theirs, number, repeats)
+        results[name] = {'nova_rng_ns': round(a, 1), 'random_ns': round(b, 1),
+                         'speedup': round(b / a, 2)}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=3000)
+    parser.add_argument('--number', type=int, default=20000)
+    parser.add_argument('--repeats', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    failed = []
+    if not check_period():
+        failed.append('period')
+    if not check_ranges():
+        failed.append('ranges')
+    if not check_seeds():
+        failed.append('seeds')
+    worst = max(uniformity(n) for n in (3, 5, 72, 256))
+    if worst > UNIFORM_TOLERANCE:
+        failed.append('uniformity')
+
+    drawn = play(SEED, args.frames, True)
+    again = play(SEED, args.frames, True)
+    undrawn = play(SEED, args.frames, False)
+    if drawn['gameplay'] != undrawn['gameplay']:
+        failed.append('effects_move_gameplay')
+    if drawn != again:
+        failed.append('replay')
+
+    results = {
+        'failed_checks': failed,
+        'period': PERIOD,
+        'noise_table_size': NOISE_SIZE,
+        'worst_bucket_deviation': round(worst, 4),
+        'game': {k: drawn[k] for k in ('wave', 'score')},
+        'per_call': timings(args.number, args.repeats),
+    }
+    print(json.dumps(results, indent=2))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""Benchmark and check the nova_save progress log.
+
+Times loading a full log, appending a save and compacting the log, in a
+temporary directory. It first checks that a save reads back as saved,
+that a torn final record falls back to the one before it, and that the
+log is compacted once it is full. Numbers are CPython file I/O on this
+machine; on the Thumby the cost is dominated by flash writes, so
+bytes_written per save is the figure to compare.
+
+    python tools/bench_save.py [--iterations 200] [--repeats 7]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import headless
+
+headless.install()
+
+import NovaNaut  # noqa: E402
+import nova_save  # noqa: E402
+from nova_save import LOG_RECORDS, RECORD_SIZE, SaveStore  # noqa: E402
+
+
+def make_state(seed):
+    state = NovaNaut.GameState()
+    state.credits = 1000 + seed
+    state.upgrades['speed'] = seed % 4
+    state.upgrades['power'] = (seed // 4) % 4
+    for score in (seed * 7, seed * 13, seed * 3):
+        state.score = score
+        state.record_score()
+    return state
+
+
+def progress(state):
+    return (state.credits, dict(state.upgrades), list(state.high_scores))
+
+
+def check(path):
+    """Return a list of failed checks; empty when everything holds."""
+    failures = []
+    store = SaveStore(path)
+    if store.load():
+        failures.append('load of a missing file found a record')
+    for seed in range(1, 4):
+        store.capture(make_state(seed))
+        store.flush()
+    loaded = NovaNaut.GameState()
+    reader = SaveStore(path)
+    if not reader.load():
+        failures.append('saved record did not load')
+    reader.apply(loaded)
+    if progress(loaded) != progress(make_state(3)):
+        failures.append('round trip changed the progress')
+
+    # Cut the last record short, as a power cut mid-append would
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 5)
+    torn = NovaNaut.GameState()
+    reader = SaveStore(path)
+    reader.load()
+    reader.apply(torn)
+    if progress(torn) != progress(make_state(2)):
+        failures.append('torn record did not fall back to the previous save')
+    reader.capture(make_state(4))
+    reader.flush()
+    if os.path.getsize(path) != RECORD_SIZE:
+        failures.append('save after a torn record did not compact')
+
+    for seed in range(5, 5 + LOG_RECORDS + 3):
+        reader.capture(make_state(seed))
+        reader.flush()
+    if os.path.getsize(path) > RECORD_SIZE * LOG_RECORDS:
+        failures.append('log grew past LOG_RECORDS')
+    final = NovaNaut.GameState()
+    reader = SaveStore(path)
+    reader.load()
+    reader.apply(final)
+    if progress(final) != progress(make_state(5 + LOG_RECORDS + 2)):
+        failures.append('latest save lost across compaction')
+    return failures
+
+
+def best_us(fn, iterations, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter_ns()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter_ns() - t0) / iterations / 1000)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--repeats', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        failures = check(os.path.join(tmp, 'check.sav'))
+
+        path = os.path.join(tmp, 'bench.sav')
+        store = SaveStore(path)
+        states = [make_state(seed) for seed in range(2)]
+        flips = [0]
+
+        def save():
+            flips[0] ^= 1
+            store.capture(states[flips[0]])
+            store.flush()
+
+        def append():
+            store.records = 0  # Never reach the compaction threshold
+            save()
+            if os.path.getsize(path) > RECORD_SIZE * (LOG_RECORDS - 1):
+                os.remove(path)
+
+        def compact():
+            store.records = LOG_RECORDS
+            save()
+
+        for _ in range(LOG_RECORDS):
+            save()
+        reader = SaveStore(path)
+        load_us = best_us(reader.load, args.iterations, args.repeats)
+        append_us = best_us(append, args.iterations, args.repeats)
+        compact_us = best_us(compact, args.iterations, args.repeats)
+
+    results = {
+        'record_bytes': RECORD_SIZE,
+        'log_records': LOG_RECORDS,
+        'bytes_written_per_save': RECORD_SIZE,
+        'load_full_log_us': round(load_us, 2),
+        'append_save_us': round(append_us, 2),
+        'compacting_save_us': round(compact_us, 2),
+        'checksum_us': round(best_us(lambda: nova_save.checksum(store.record, 0), args.iterations * 10,
+                                     args.repeats), 2),
+        'failed_checks': failures,
+    }
+    print(json.dumps(results, indent=2))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
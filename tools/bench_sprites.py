@@ -0,0 +1,127 @@
+"""Benchmark and check loading the packed sprite sheet.
+
+First checks that novanaut.spr matches tools/build_sprites.py, that
+every bitmap read back equals its source, and that each sprite's bitmap
+is a view into the one sheet buffer rather than a copy. Then it times
+SpriteSheet.load against compiling and running the same bitmaps as
+bytearray literals, which is what importing the game used to cost. Both
+are timed for the game's sheet and for a synthetic sheet of --many
+sprites, and the heap blocks each one leaves behind are counted.
+
+    python tools/bench_sprites.py [--iterations 2000] [--repeats 7] [--many 64]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import headless
+
+headless.install()
+
+import NovaNaut  # noqa: E402
+from build_sprites import SHEET_PATH, SPRITES, build  # noqa: E402
+from nova_sprites import SpriteSheet  # noqa: E402
+
+
+def check():
+    """Return a list of failed checks; empty when everything holds."""
+    failures = []
+    with open(SHEET_PATH, 'rb') as f:
+        if f.read() != build():
+            failures.append('novanaut.spr is out of date')
+    sheet = SpriteSheet(SHEET_PATH)
+    for name, width, height, source in SPRITES:
+        bitmap, w, h = sheet.bitmap(name)
+        if (bytes(bitmap), w, h) != (source, width, height):
+            failures.append(name + ' differs from its source')
+        sprite = sheet.sprite(name)
+        if not isinstance(sprite.bitmap, memoryview) or sprite.bitmap.obj is not sheet.buffer:
+            failures.append(name + ' sprite is not a view into the sheet')
+    game = NovaNaut.NovaNaut()
+    for bitmap in (game.player.bitmap,) + NovaNaut.ALIEN_BITMAPS:
+        if bitmap.obj is not NovaNaut.SPRITE_SHEET.buffer:
+            failures.append('game sprite is not a view into the sheet')
+    return failures
+
+
+def literals(sprites):
+    """The old way: one bytearray literal per bitmap, compiled and run at import."""
+    source = 'maps = {\n%s}\n' % ''.join('    %r: bytearray(%r),\n' % (name, list(bitmap))
+                                        for name, _, _, bitmap in sprites)
+
+    def load():
+        scope = {}
+        exec(compile(source, '<sprites>', 'exec'), scope)
+        return scope['maps']
+    return load
+
+
+def best_us(fn, iterations, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter_ns()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter_ns() - t0) / iterations / 1000)
+    return best
+
+
+def blocks(fn):
+    """Heap blocks the result of fn() keeps alive."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = fn()  # noqa: F841
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return sum(stat.count_diff for stat in after.compare_to(before, 'lineno') if stat.count_diff > 0)
+
+
+def compare(sprites, path, iterations, repeats):
+    with open(path, 'wb') as f:
+        f.write(build(sprites))
+    sheet = SpriteSheet()
+    old = literals(sprites)
+
+    def load():
+        sheet.load(path)
+        return sheet
+    return {
+        'sprites': len(sprites),
+        'sheet_bytes': os.path.getsize(path),
+        'sheet_load_us': round(best_us(load, iterations, repeats), 2),
+        'literals_us': round(best_us(old, iterations, repeats), 2),
+        'sheet_blocks': blocks(lambda: SpriteSheet(path)),
+        'literal_blocks': blocks(old),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--many', type=int, default=64)
+    args = parser.parse_args(argv)
+
+    many = [('enemy%d' % i, 8, 8, bytes((i * 37 + k * 11) & 0xff for k in range(8))) for i in range(args.many)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.spr')
+        results = {
+            'failed_checks': check(),
+            'game_sheet': compare(SPRITES, path, args.iterations, args.repeats),
+            'many_sprites': compare(many, path, args.iterations // 4 or 1, args.repeats),
+        }
+    print(json.dumps(results, indent=2))
+    if results['failed_checks']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
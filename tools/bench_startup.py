@@ -0,0 +1,110 @@
+"""Measure NovaNaut's cold start and the RAM its code keeps resident.
+
+Each measurement runs in a fresh interpreter with an empty bytecode
+cache, so modules are compiled from source as they are on the device. It
+times `import NovaNaut` and building the game object, and reads the heap with tracemalloc at
+each step. Then each screen module goes through NovaNaut.show_screen
+twice, with B (A for the menu) pressed on the second frame. For the
+second visit the tool records how much the screen held while it was
+shown, how much was left after it returned, and whether the module was
+really unloaded. These are CPython figures. On the Thumby, compare
+gc.mem_alloc() at the same points.
+
+    python tools/bench_startup.py [--repeats 7]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+SCREENS = ('nova_menu', 'nova_upgrade', 'nova_scores', 'nova_gameover')
+
+CHILD = r'''
+import gc, json, os, sys, tempfile, time, tracemalloc
+sys.pycache_prefix = tempfile.mkdtemp()  # Compile from source, as the Thumby does
+sys.path.insert(0, %(here)r)
+sys.path.insert(0, %(root)r)
+import headless
+thumby = headless.install()
+trace = %(trace)r
+if trace:
+    tracemalloc.start()
+gc.collect()
+base = tracemalloc.get_traced_memory()[0]
+t0 = time.perf_counter()
+import NovaNaut
+t1 = time.perf_counter()
+game = NovaNaut.NovaNaut()
+t2 = time.perf_counter()
+gc.collect()
+out = {'import_ms': (t1 - t0) * 1000, 'construct_ms': (t2 - t1) * 1000}
+if trace:
+    out['import_bytes'] = tracemalloc.get_traced_memory()[0] - base
+    out['screens_resident'] = sorted(name for name in %(screens)r if name in sys.modules)
+    tmp = tempfile.mkdtemp()
+    game.save.path = os.path.join(tmp, 'bench.sav')
+    update = thumby.display.update
+    screens = {}
+    # The first pass only warms the stand-in's glyph cache and button state
+    for name in %(screens)r * 2:
+        frames = [0]
+        peak = [0]
+        def press():
+            update()
+            frames[0] += 1
+            headless.set_buttons(('A' if name == 'nova_menu' else 'B') if frames[0] == 1 else '')
+            gc.collect()
+            peak[0] = max(peak[0], tracemalloc.get_traced_memory()[0])
+        thumby.display.update = press
+        headless.set_buttons('')
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        game.show_screen(name)
+        entered_ms = (time.perf_counter() - t0) * 1000
+        thumby.display.update = update
+        gc.collect()
+        screens[name] = {
+            'held_bytes': peak[0] - before,
+            'left_bytes': tracemalloc.get_traced_memory()[0] - before,
+            'unloaded': name not in sys.modules,
+            'enter_and_leave_ms': entered_ms,
+        }
+    out['screens'] = screens
+print(json.dumps(out))
+'''
+
+
+def run_child(trace):
+    code = CHILD % {'here': HERE, 'root': ROOT, 'trace': trace, 'screens': SCREENS}
+    done = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(done.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    timings = [run_child(False) for _ in range(args.repeats)]
+    memory = run_child(True)
+    screens = memory['screens']
+    results = {
+        'import_ms': round(min(t['import_ms'] for t in timings), 2),
+        'construct_ms': round(min(t['construct_ms'] for t in timings), 2),
+        'resident_bytes_after_import': memory['import_bytes'],
+        'screens_resident_after_import': memory['screens_resident'],
+        'screens': {name: {key: round(value, 2) if isinstance(value, float) else value
+                           for key, value in screen.items()}
+                    for name, screen in screens.items()},
+    }
+    print(json.dumps(results, indent=2))
+    if memory['screens_resident'] or not all(s['unloaded'] for s in screens.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
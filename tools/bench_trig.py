@@ -0,0 +1,123 @@
+"""Microbenchmark: nova_trig table lookups against the math module.
+
+Times the three hot paths that moved to tables, each written both ways:
+a single sin/cos pair, one frame of shield ring vertices, and the three
+spread-shot velocity vectors. Reports best-of-N nanoseconds per call and
+the largest pixel difference between the two shield rings. Checks that
+the spread table holds the rounded float velocities and that the up and
+down shots mirror each other.
+
+    python tools/bench_trig.py [--number 20000] [--repeats 7]
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import headless
+
+headless.install()
+
+import nova_trig  # noqa: E402
+from NovaNaut import FP_SHIFT  # noqa: E402
+from nova_trig import (ANGLE_MASK, ANGLE_STEPS, QUARTER_TURN, SHIELD_PHASES,  # noqa: E402
+                       SHIELD_RADIUS, SHIELD_SEGMENTS, SHIELD_X, SHIELD_Y, SIN,
+                       SPREAD_ANGLES, SPREAD_DX, SPREAD_DY, SPREAD_SHIFT, SPREAD_SPEED)
+
+
+def sincos_math(angle=1.234):
+    return math.cos(angle), math.sin(angle)
+
+
+def sincos_table(step=13):
+    return SIN[(step + QUARTER_TURN) & ANGLE_MASK], SIN[step & ANGLE_MASK]
+
+
+def shield_math(t=1.234, cx=30, cy=20):
+    out = []
+    for i in range(SHIELD_SEGMENTS):
+        angle = (i / SHIELD_SEGMENTS) * 2 * math.pi
+        out.append((int(cx + math.cos(angle + t) * SHIELD_RADIUS),
+                    int(cy + math.sin(angle + t) * SHIELD_RADIUS)))
+    return out
+
+
+def shield_table(phase=3, cx=30, cy=20):
+    out = []
+    base = phase % SHIELD_PHASES * SHIELD_SEGMENTS
+    for i in range(base, base + SHIELD_SEGMENTS):
+        out.append((cx + SHIELD_X[i], cy + SHIELD_Y[i]))
+    return out
+
+
+def spread_math():
+    out = []
+    for angle in SPREAD_ANGLES:
+        out.append((round(math.cos(math.radians(angle)) * SPREAD_SPEED * (1 << FP_SHIFT)),
+                    round(math.sin(math.radians(angle)) * (1 << FP_SHIFT))))
+    return out
+
+
+def spread_table():
+    out = []
+    for i in range(len(SPREAD_DX)):
+        out.append((SPREAD_DX[i], SPREAD_DY[i]))
+    return out
+
+
+def check_spread():
+    """The table matches the float velocities, and mirrored angles mirror dy."""
+    n = len(SPREAD_ANGLES)
+    mirrored = all(SPREAD_ANGLES[i] == -SPREAD_ANGLES[n - 1 - i] and
+                   SPREAD_DY[i] == -SPREAD_DY[n - 1 - i] and SPREAD_DX[i] == SPREAD_DX[n - 1 - i]
+                   for i in range(n))
+    return SPREAD_SHIFT == FP_SHIFT and mirrored and spread_table() == spread_math()
+
+
+def shield_error():
+    """Largest vertex difference, in pixels, over every table phase."""
+    worst = 0
+    for step in range(ANGLE_STEPS):
+        t = step * 2 * math.pi / ANGLE_STEPS
+        exact = sorted(shield_math(t))
+        table = sorted(shield_table(step))
+        for (ax, ay), (bx, by) in zip(exact, table):
+            worst = max(worst, abs(ax - bx), abs(ay - by))
+    return worst
+
+
+def best_ns(fn, number, repeats):
+    return min(timeit.repeat(fn, number=number, repeat=repeats)) / number * 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=20000)
+    parser.add_argument('--repeats', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    failed = []
+    if not check_spread():
+        failed.append('spread')
+    results = {'failed_checks': failed, 'angle_steps': nova_trig.ANGLE_STEPS,
+               'shield_max_pixel_error': shield_error(), 'spread': spread_table()}
+    for name, math_fn, table_fn in (('sincos', sincos_math, sincos_table),
+                                    ('shield_ring', shield_math, shield_table),
+                                    ('spread_shot', spread_math, spread_table)):
+        m = best_ns(math_fn, args.number, args.repeats)
+        t = best_ns(table_fn, args.number, args.repeats)
+        results[name] = {'math_ns': round(m, 1), 'table_ns': round(t, 1),
+                         'speedup': round(m / t, 2)}
+    print(json.dumps(results, indent=2))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
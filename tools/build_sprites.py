@@ -0,0 +1,86 @@
+"""Build novanaut.spr, the packed sprite sheet nova_sprites loads.
+
+SPRITES is the source for every bitmap in the game: (name, width, height,
+bytes), in the Thumby's layout of one byte per column and one band of 8
+rows per page. Edit it, then rebuild the sheet:
+
+    python tools/build_sprites.py [--check] [-o novanaut.spr]
+
+--check only compares the sheet on disk with what would be built and
+exits non-zero if it is stale.
+"""
+import argparse
+import os
+import struct
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+sys.path.insert(0, ROOT)
+
+import headless
+
+headless.install()
+
+from nova_sprites import ENTRY_SIZE, HEADER_SIZE, SHEET_ENTRY, SHEET_HEADER, SHEET_MAGIC  # noqa: E402
+
+SHEET_PATH = os.path.join(ROOT, 'novanaut.spr')
+
+SPRITES = (
+    ('player', 13, 11, bytes([
+        0b00000010, 0b00000110, 0b00001110, 0b00011110,
+        0b00111110, 0b01111110, 0b00111110, 0b00011110,
+        0b00001110, 0b00000110, 0b00000010, 0b00000000,
+        0b00000000, 0b00000000, 0b00000000, 0b00100000,
+        0b01110000, 0b11111000, 0b01110000, 0b00100000,
+        0b00000000, 0b00000000, 0b00000000, 0b00000000,
+        0b00000000, 0b00000000,
+    ])),
+    ('basic', 8, 8, bytes([60, 126, 219, 255, 255, 219, 126, 60])),
+    ('scout', 8, 8, bytes([24, 60, 126, 255, 255, 126, 60, 24])),
+    ('elite', 8, 8, bytes([60, 126, 255, 255, 255, 255, 126, 60])),
+    ('boss', 16, 8, bytes([60, 126, 255, 255, 255, 255, 126, 60] * 2)),
+)
+
+
+def build(sprites=SPRITES):
+    """The sheet's bytes for a sequence of (name, width, height, bitmap)."""
+    header = bytearray(struct.pack(SHEET_HEADER, SHEET_MAGIC, len(sprites)))
+    offset = HEADER_SIZE + ENTRY_SIZE * len(sprites)
+    data = bytearray()
+    for name, width, height, bitmap in sprites:
+        if len(bitmap) != width * ((height + 7) >> 3):
+            raise ValueError('%s: %d bytes for %dx%d' % (name, len(bitmap), width, height))
+        if len(name) > 8:
+            raise ValueError('%s: names are at most 8 bytes' % name)
+        header += struct.pack(SHEET_ENTRY, name.encode(), offset + len(data), width, height)
+        data += bitmap
+    return bytes(header + data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-o', '--output', default=SHEET_PATH)
+    parser.add_argument('--check', action='store_true')
+    args = parser.parse_args(argv)
+
+    sheet = build()
+    if args.check:
+        try:
+            with open(args.output, 'rb') as f:
+                current = f.read()
+        except OSError:
+            current = None
+        if current != sheet:
+            print('%s is out of date; run tools/build_sprites.py' % args.output)
+            sys.exit(1)
+        print('%s is up to date (%d bytes)' % (args.output, len(sheet)))
+        return
+    with open(args.output, 'wb') as f:
+        f.write(sheet)
+    print('wrote %s: %d sprites, %d bytes' % (args.output, len(SPRITES), len(sheet)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Compare FIXED_POINT trajectories against the float version.
+
+Drives the player with seeded d-pad input across every speed upgrade level,
+with and without the SPEED power-up, sends one alien of each type across the
+screen and lets floating score texts rise. The same script runs once per
+mode and the drawn pixel positions are compared frame by frame; the check
+fails if any entity is ever more than one pixel away from its float twin.
+
+    python tools/check_fixed_point.py [--seeds 20] [--frames 600]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import headless
+
+headless.install()
+
+import NovaNaut  # noqa: E402
+from nova_upgrade import MAX_UPGRADE_LEVEL  # noqa: E402
+
+TOLERANCE = 1
+TEXT_EVERY = 40  # Frames between floating texts
+
+
+def trace(fixed_point, seed, frames):
+    """Per-frame drawn positions of the player, aliens and floating texts."""
+    NovaNaut.FIXED_POINT = fixed_point
+    headless.reset()
+    rng = random.Random(seed)
+    game = NovaNaut.NovaNaut()
+    game.reset_game_state(seed)
+    game.state.wave_enemies = 0
+    game.state.upgrades['speed'] = seed % (MAX_UPGRADE_LEVEL + 1)
+
+    frames_out = []
+    buttons = ''
+    for n in range(frames):
+        if n % 12 == 0:
+            buttons = ''.join(rng.sample('UDLR', rng.randint(0, 2)))
+        headless.set_buttons(buttons)
+        if n % 150 == 0:
+            game.state.current_powerup = NovaNaut.PowerUp('SPEED', 0, 0) if (n // 150) % 2 else None
+        if n % 100 == 0:
+            for alien_type in range(len(NovaNaut.ALIEN_TYPES)):
+                game.spawn_alien(alien_type, 8 * alien_type)
+        if n % TEXT_EVERY == 0 and game.aliens:
+            # Score a fresh alien so the text starts from a known spot
+            game.handle_alien_destroyed(game.spawn_alien(NovaNaut.ALIEN_BASIC, 20 + n % 12))
+
+        game.handle_input()
+        game.update_player_position()
+        game.update_aliens()
+        game.update_floating_texts()
+
+        shift = NovaNaut.FP_SHIFT if fixed_point else 0
+        frames_out.append((
+            (int(game.player.x), int(game.player.y)),
+            [(int(a.x), a.y) for a in game.aliens],
+            [(t['x'], t['y'] >> shift if fixed_point else int(t['y'])) for t in game.floating_texts],
+        ))
+    NovaNaut.FIXED_POINT = 0
+    return frames_out
+
+
+def worst_error(a, b):
+    """Largest per-axis pixel difference between two entity lists, or None if they differ in length."""
+    if len(a) != len(b):
+        return None
+    worst = 0
+    for (ax, ay), (bx, by) in zip(a, b):
+        worst = max(worst, abs(ax - bx), abs(ay - by))
+    return worst
+
+
+def compare(seed, frames):
+    errors = {'player': 0, 'aliens': 0, 'texts': 0}
+    for float_frame, fixed_frame in zip(trace(0, seed, frames), trace(1, seed, frames)):
+        for key, a, b in zip(errors, float_frame, fixed_frame):
+            if key == 'player':
+                a, b = [a], [b]
+            err = worst_error(a, b)
+            errors[key] = float('inf') if err is None else max(errors[key], err)
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seeds', type=int, default=20)
+    parser.add_argument('--frames', type=int, default=600)
+    args = parser.parse_args(argv)
+
+    worst = {'player': 0, 'aliens': 0, 'texts': 0}
+    failures = []
+    for seed in range(args.seeds):
+        errors = compare(seed, args.frames)
+        for key, err in errors.items():
+            worst[key] = max(worst[key], err)
+        if max(errors.values()) > TOLERANCE:
+            failures.append(seed)
+    print(json.dumps({'seeds': args.seeds, 'frames': args.frames, 'tolerance_px': TOLERANCE,
+                      'max_error_px': worst, 'failed_seeds': failures}, indent=2))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+"""Check NovaNaut's input recording and replay, or play a recording back.
+
+The checks:
+  round_trip   random button streams, with runs of every encoded length
+               and past 255 steps, saved, loaded and read back step for
+               step, ending on the last one
+  overflow     a recording that fills its buffer stops cleanly and plays
+               back the steps it kept
+  replay       a game played through game_loop by the batch_sim autopilot
+               and recorded the way run() records it, with upgrades
+               bought, played back with play_replay drawn and undrawn:
+               every step must match, the game must end on the same
+               step, and the player's own upgrades, credits and scores
+               must be the same after the replay as before it
+It reports the recording's size and how fast playback runs.
+
+    python tools/check_replay.py [--seed 5] [--trials 200]
+    python tools/check_replay.py --play novanaut.rec [--no-draw] [--hot 15]
+
+--play replays a recording, say one copied off a device, and reports the
+result, the steps per second and, with --hot N, the N functions with the
+most time of their own under cProfile.
+"""
+import argparse
+import cProfile
+import hashlib
+import json
+import os
+import pstats
+import random
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import headless
+
+thumby = headless.install()
+
+import NovaNaut  # noqa: E402
+import nova_replay  # noqa: E402
+from batch_sim import autopilot  # noqa: E402
+from nova_replay import HEADER_SIZE, InputLog  # noqa: E402
+
+UPGRADES = {'speed': 1, 'power': 2, 'shield': 1}
+
+
+# === CHECKS ===
+
+def random_stream(rng, steps):
+    """Button masks that hold for a while, sometimes for hundreds of steps."""
+    masks = []
+    while len(masks) < steps:
+        mask = rng.getrandbits(6)
+        masks.extend([mask] * rng.choice((1, 2, 3, 4, 5, 40, 255, 256, 600)))
+    return masks[:steps]
+
+
+def play_back(log):
+    """Every mask a loaded log hands out, up to and including the one that ends it."""
+    masks = []
+    while not log.ended:
+        masks.append(log.next())
+    return masks
+
+
+def check_round_trip(trials, path, seed=1):
+    rng = random.Random(seed)
+    for _ in range(trials):
+        masks = random_stream(rng, rng.randint(1, 3000))
+        log = InputLog()
+        log.start_recording(rng.getrandbits(16), UPGRADES)
+        for mask in masks:
+            log.record(mask)
+        size = log.save(path)
+        again = InputLog()
+        if not again.load(path) or size != HEADER_SIZE + log.length:
+            return False
+        if again.steps != len(masks) or again.seed != log.seed or play_back(again) != masks:
+            return False
+    return True
+
+
+def check_overflow(path):
+    """Buffers that fill on a new run and on a run that needs its count byte."""
+    for capacity, masks, kept in ((4, [1, 1, 1, 1, 2, 3, 4, 5], 6), (2, [1, 2, 2, 2, 2, 2], 4)):
+        log = InputLog(capacity)
+        log.start_recording(1, UPGRADES)
+        for mask in masks:
+            log.record(mask)
+        log.save(path)
+        again = InputLog()
+        if not (log.full and again.load(path) and play_back(again) == masks[:kept]):
+            return False
+    return True
+
+
+def record_game(seed, path):
+    """Play one game through game_loop with the autopilot, recording it to path."""
+    headless.reset()
+    game = NovaNaut.NovaNaut()
+    game.reset_game_state(seed)
+    game.state.upgrades = dict(UPGRADES)
+    trace = watch(game)
+    handle_input = game.handle_input
+
+    def piloted():
+        headless.set_buttons(autopilot(game))
+        handle_input()
+
+    game.handle_input = piloted
+    game.input.start_recording(game.level_seed, game.state.upgrades)
+    game.game_loop()
+    game.input.stop()
+    return {'steps': game.input.steps, 'bytes': game.input.save(path),
+            'score': game.state.score, 'wave': game.state.wave_number,
+            'trace': trace.hexdigest()}
+
+
+def watch(game):
+    """Hash the gameplay state after every update() into the returned md5."""
+    trace = hashlib.md5()
+    update = game.update
+
+    def traced():
+        update()
+        state = game.state
+        trace.update(repr((game.rng.state, state.score, state.lives, state.wave_number,
+                           game.player.x, game.player.y,
+                           [(a.type, a.x, a.y) for a in game.aliens])).encode())
+
+    game.update = traced
+    return trace
+
+
+def replay_game(path, render):
+    headless.reset()
+    game = NovaNaut.NovaNaut()
+    trace = watch(game)
+    state = game.state
+    mine = {'speed': 0, 'power': 0, 'shield': 3}
+    state.upgrades = dict(mine)
+    state.credits = 7
+    state.high_scores = [90, 40, 0]
+    state.high_score = 90
+    t0 = time.perf_counter()
+    steps = game.play_replay(path, render)
+    seconds = time.perf_counter() - t0
+    return {'steps': steps, 'played': game.scheduler.steps, 'score': game.state.score,
+            'wave': game.state.wave_number, 'trace': trace.hexdigest(),
+            'upgrades_restored': state.upgrades == mine,
+            'credits_restored': state.credits == 7,
+            'scores_restored': state.high_score == 90 and state.high_scores == [90, 40, 0],
+            'steps_per_second': round(game.scheduler.steps / seconds)}
+
+
+# === PLAYBACK ===
+
+def play_file(path, render, hot):
+    headless.reset()
+    game = NovaNaut.NovaNaut()
+    profile = cProfile.Profile() if hot else None
+    t0 = time.perf_counter()
+    if profile:
+        profile.enable()
+    steps = game.play_replay(path, render)
+    if profile:
+        profile.disable()
+    seconds = time.perf_counter() - t0
+    if steps < 0:
+        sys.exit('%s is not a NovaNaut recording' % path)
+    results = {
+        'steps': steps,
+        'seed': game.input.seed,
+        'wave': game.state.wave_number,
+        'score': game.state.score,
+        'died': game.state.lives <= 0,
+        'seconds': round(seconds, 2),
+        'steps_per_second': round(game.scheduler.steps / seconds),
+    }
+    if profile:
+        stats = pstats.Stats(profile).stats
+        rows = sorted(stats.items(), key=lambda item: -item[1][2])[:hot]
+        results['hot'] = [['%s:%d %s' % (os.path.basename(f), line, name),
+                           round(tottime * 1000, 1), calls]
+                          for (f, line, name), (_, calls, tottime, _, _) in rows]
+    print(json.dumps(results, indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seed', type=int, default=5)
+    parser.add_argument('--trials', type=int, default=200)
+    parser.add_argument('--play', metavar='FILE')
+    parser.add_argument('--no-draw', action='store_true')
+    parser.add_argument('--hot', type=int, default=0, metavar='N')
+    args = parser.parse_args(argv)
+
+    if args.play:
+        play_file(args.play, not args.no_draw, args.hot)
+        return
+
+    failed = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'novanaut.rec')
+        if not check_round_trip(args.trials, path):
+            failed.append('round_trip')
+        if not check_overflow(path):
+            failed.append('overflow')
+        recorded = record_game(args.seed, path)
+        drawn = replay_game(path, True)
+        undrawn = replay_game(path, False)
+    for name, run in (('replay_drawn', drawn), ('replay_undrawn', undrawn)):
+        if (run['steps'] != recorded['steps'] or run['played'] != recorded['steps']
+                or run['trace'] != recorded['trace'] or run['score'] != recorded['score']):
+            failed.append(name)
+        for kept in ('upgrades', 'credits', 'scores'):
+            if not run[kept + '_restored']:
+                failed.append('%s_%s' % (name, kept))
+
+    minutes = recorded['steps'] / NovaNaut.FPS / 60
+    results = {
+        'failed_checks': failed,
+        'game': {k: recorded[k] for k in ('steps', 'wave', 'score')},
+        'recording_bytes': recorded['bytes'],
+        'bytes_per_minute': round(recorded['bytes'] / minutes),
+        'buffer_minutes': round(nova_replay.REPLAY_BYTES / (recorded['bytes'] / minutes), 1),
+        'steps_per_second': {'drawn': drawn['steps_per_second'],
+                             'undrawn': undrawn['steps_per_second'],
+                             'realtime': NovaNaut.FPS},
+    }
+    print(json.dumps(results, indent=2))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
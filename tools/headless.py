@@ -0,0 +1,340 @@
+"""Pure-Python platform backend so NovaNaut runs on plain CPython.
+
+nova_platform loads this module when there is no `thumby` to import, and
+the game then uses its `thumby`, `const`, clock and heap functions.
+
+The framebuffer uses the same SSD1306 page layout as the device
+(72 columns x 5 pages, bit 0 of a byte is the top row of its page), so
+anything that reads or writes `thumby.display.display.buffer` behaves as it
+would on hardware. Text uses placeholder glyphs of the real 5x7 size.
+Buttons are set with `set_buttons()`, audio only counts its calls, and the
+clock is virtual: it moves when the game sleeps or a driver calls
+`clock.advance_us()`.
+"""
+import tracemalloc
+import types
+
+WIDTH = 72
+HEIGHT = 40
+PAGES = HEIGHT // 8
+HEAP_BYTES = 160 * 1024  # Roughly the Thumby's MicroPython heap
+
+
+class VirtualClock:
+    """Deterministic replacement for the MicroPython ticks_* and sleep_* functions."""
+
+    def __init__(self):
+        self.us = 0
+
+    def advance_us(self, us):
+        self.us += int(us)
+
+    def ticks_us(self):
+        return self.us
+
+    def ticks_ms(self):
+        return self.us // 1000
+
+
+class Button:
+    def __init__(self):
+        self.down = False
+        self.was_down = False
+
+    def set(self, down):
+        self.was_down = self.down
+        self.down = bool(down)
+
+    def pressed(self):
+        return self.down
+
+    def justPressed(self):
+        return self.down and not self.was_down
+
+
+class Sprite:
+    def __init__(self, width, height, bitmapData, x=0, y=0, key=-1, mirrorX=0, mirrorY=0):
+        self.width = width
+        self.height = height
+        self.bitmapSource = bitmapData
+        self.bitmapByteCount = width * ((height + 7) // 8)
+        self.frameCount = max(1, len(bitmapData) // self.bitmapByteCount)
+        self.bitmap = memoryview(bitmapData)[0:self.bitmapByteCount]
+        self.x = x
+        self.y = y
+        self.key = key
+        self.mirrorX = mirrorX
+        self.mirrorY = mirrorY
+        self.currentFrame = 0
+
+    def getFrame(self):
+        return self.currentFrame
+
+    def setFrame(self, frame):
+        frame %= self.frameCount
+        if frame != self.currentFrame:
+            self.currentFrame = frame
+            offset = frame * self.bitmapByteCount
+            self.bitmap = memoryview(self.bitmapSource)[offset:offset + self.bitmapByteCount]
+
+
+class Audio:
+    def __init__(self):
+        self.enabled = True
+        self.plays = 0
+        self.last = None
+
+    def play(self, freq, duration):
+        if self.enabled:
+            self.plays += 1
+            self.last = (freq, duration)
+
+    def playBlocking(self, freq, duration):
+        self.play(freq, duration)
+
+    def stop(self):
+        self.last = None
+
+    def setEnabled(self, setting=True):
+        self.enabled = setting
+
+
+class SSD1306:
+    def __init__(self):
+        self.buffer = bytearray(WIDTH * PAGES)
+
+
+# Per-byte translation tables for the byte-wise blit
+_SHL = [bytes((b << s) & 0xff for b in range(256)) for s in range(8)]
+_SHR = [bytes(b >> s for b in range(256)) for s in range(9)]
+_AND = [bytes(b & m for b in range(256)) for m in range(256)]
+_REV = bytes(int('{:08b}'.format(b)[::-1], 2) for b in range(256))
+
+_glyphs = {}
+
+
+def _glyph(ch):
+    cols = _glyphs.get(ch)
+    if cols is None:
+        if ch == ' ':
+            cols = bytes(5)
+        else:
+            o = ord(ch)
+            cols = bytes(((o * (i + 3) * 2654435761) >> 9) & 0x7f for i in range(5))
+        _glyphs[ch] = cols
+    return cols
+
+
+class Display:
+    def __init__(self):
+        self.display = SSD1306()
+        self.width = WIDTH
+        self.height = HEIGHT
+        self.fps = 0
+        self.frames = 0
+        self.on_update = None
+
+    def setFPS(self, fps):
+        self.fps = fps
+
+    def update(self):
+        self.frames += 1
+        if self.on_update is not None:
+            self.on_update(self.display.buffer)
+
+    def fill(self, color):
+        buf = self.display.buffer
+        buf[:] = (b'\xff' if color else b'\x00') * len(buf)
+
+    def setPixel(self, x, y, color):
+        x = int(x)
+        y = int(y)
+        if 0 <= x < WIDTH and 0 <= y < HEIGHT:
+            i = (y >> 3) * WIDTH + x
+            if color:
+                self.display.buffer[i] |= 1 << (y & 7)
+            else:
+                self.display.buffer[i] &= ~(1 << (y & 7)) & 0xff
+
+    def getPixel(self, x, y):
+        x = int(x)
+        y = int(y)
+        if 0 <= x < WIDTH and 0 <= y < HEIGHT:
+            return (self.display.buffer[(y >> 3) * WIDTH + x] >> (y & 7)) & 1
+        return 0
+
+    def drawLine(self, x1, y1, x2, y2, color):
+        x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+        dx = abs(x2 - x1)
+        dy = -abs(y2 - y1)
+        sx = 1 if x1 < x2 else -1
+        sy = 1 if y1 < y2 else -1
+        err = dx + dy
+        while True:
+            self.setPixel(x1, y1, color)
+            if x1 == x2 and y1 == y2:
+                return
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+            if e2 <= dx:
+                err += dx
+                y1 += sy
+
+    def drawFilledRectangle(self, x, y, width, height, color):
+        x, y, width, height = int(x), int(y), int(width), int(height)
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = min(WIDTH, x + width)
+        y1 = min(HEIGHT, y + height)
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                self.setPixel(xx, yy, color)
+
+    def drawRectangle(self, x, y, width, height, color):
+        x, y, width, height = int(x), int(y), int(width), int(height)
+        if width <= 0 or height <= 0:
+            return
+        self.drawLine(x, y, x + width - 1, y, color)
+        self.drawLine(x, y + height - 1, x + width - 1, y + height - 1, color)
+        self.drawLine(x, y, x, y + height - 1, color)
+        self.drawLine(x + width - 1, y, x + width - 1, y + height - 1, color)
+
+    def drawText(self, stringToPrint, x, y, color):
+        x = int(x)
+        y = int(y)
+        for ch in stringToPrint:
+            cols = _glyph(ch)
+            for i in range(5):
+                bits = cols[i]
+                row = 0
+                while bits:
+                    if bits & 1:
+                        self.setPixel(x + i, y + row, color)
+                    bits >>= 1
+                    row += 1
+            x += 6
+
+    def blit(self, bitmapData, x, y, width, height, key, mirrorX, mirrorY):
+        x = int(x)
+        y = int(y)
+        if key not in (-1, 0) or (mirrorY and height & 7):
+            self._blit_pixels(bitmapData, x, y, width, height, key, mirrorX, mirrorY)
+            return
+        # Byte-wise path: each source page lands in at most two framebuffer
+        # pages, shifted down by y & 7. Whole rows are combined as integers.
+        # mirrorX reverses each row; mirrorY (whole pages only) reverses the
+        # page order and the bits in each byte.
+        x0 = max(0, x)
+        x1 = min(WIDTH, x + width)
+        if x0 >= x1:
+            return
+        n = x1 - x0
+        buf = self.display.buffer
+        shift = y & 7
+        page0 = y >> 3
+        pages = (height + 7) >> 3
+        for p in range(pages):
+            rows = min(8, height - p * 8)
+            keep = (1 << rows) - 1
+            sp = pages - 1 - p if mirrorY else p
+            if mirrorX:
+                src = bytes(bitmapData[sp * width + width - (x1 - x):sp * width + width - (x0 - x)])[::-1]
+            else:
+                src = bytes(bitmapData[sp * width + x0 - x:sp * width + x1 - x])
+            if mirrorY:
+                src = src.translate(_REV)
+            if rows < 8:
+                src = src.translate(_AND[keep])
+            parts = [(page0 + p, _SHL[shift], (keep << shift) & 0xff)]
+            if shift:
+                parts.append((page0 + p + 1, _SHR[8 - shift], keep >> (8 - shift)))
+            for page, table, mask in parts:
+                if not (0 <= page < PAGES and mask):
+                    continue
+                a = page * WIDTH + x0
+                dst = int.from_bytes(buf[a:a + n], 'little')
+                bits = int.from_bytes(src.translate(table), 'little')
+                if key == -1:
+                    dst &= ~int.from_bytes(bytes((mask,)) * n, 'little')
+                buf[a:a + n] = (dst | bits).to_bytes(n, 'little')
+
+    def _blit_pixels(self, bitmapData, x, y, width, height, key, mirrorX, mirrorY):
+        for j in range(height):
+            sj = height - 1 - j if mirrorY else j
+            for i in range(width):
+                si = width - 1 - i if mirrorX else i
+                bit = (bitmapData[(sj >> 3) * width + si] >> (sj & 7)) & 1
+                if key == -1 or bit != key:
+                    self.setPixel(x + i, y + j, bit)
+
+    def drawSprite(self, s):
+        self.blit(s.bitmap, s.x, s.y, s.width, s.height, s.key, s.mirrorX, s.mirrorY)
+
+
+def _make_thumby():
+    mod = types.ModuleType('thumby')
+    mod.display = Display()
+    mod.audio = Audio()
+    mod.Sprite = Sprite
+    mod.buttonU = Button()
+    mod.buttonD = Button()
+    mod.buttonL = Button()
+    mod.buttonR = Button()
+    mod.buttonA = Button()
+    mod.buttonB = Button()
+    return mod
+
+
+def _mem_alloc():
+    # Only meaningful while tracemalloc is tracing; 0 otherwise
+    return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+def _mem_free():
+    return max(0, HEAP_BYTES - _mem_alloc())
+
+
+def const(x):
+    return x
+
+
+def ticks_diff(a, b):
+    return a - b
+
+
+clock = VirtualClock()
+thumby = _make_thumby()
+ticks_ms = clock.ticks_ms
+ticks_us = clock.ticks_us
+sleep_us = clock.advance_us
+mem_alloc = _mem_alloc
+mem_free = _mem_free
+
+BUTTONS = ('U', 'D', 'L', 'R', 'A', 'B')
+
+
+def install():
+    """Return the stand-in thumby for a driver to script.
+
+    The game finds this backend through nova_platform on its own; drivers
+    call this first so they hold the same object the game draws to.
+    """
+    return thumby
+
+
+def set_buttons(pressed=''):
+    """Hold the buttons named in `pressed` (e.g. 'UA') and release the rest."""
+    for name in BUTTONS:
+        getattr(thumby, 'button' + name).set(name in pressed)
+
+
+def reset():
+    clock.us = 0
+    set_buttons('')
+    set_buttons('')
+    thumby.display.fill(0)
+    thumby.display.frames = 0
+    thumby.display.on_update = None
+    thumby.audio.plays = 0